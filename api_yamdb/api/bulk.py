@@ -0,0 +1,234 @@
+from functools import partial
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+
+from api_yamdb.cache_versions import TITLE_FACETS, bump_version
+from api_yamdb.shadow_fields import fill_shadow_fields
+from reviews.models import Category, Genre, Title, TitleGenre
+from reviews.slugs import category_slugs, genre_slugs
+from .fast_serializers import FastTitleReadSerializer
+from .serializers import (
+    TitleWriteSerializer, deleted_slug_errors, find_deleted_slugs
+)
+
+CREATED = 'created'
+UPDATED = 'updated'
+INVALID = 'invalid'
+SKIPPED = 'skipped'
+
+
+def is_id(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def collect_slugs(items, field):
+    """Every string slug referenced by `field` across the items."""
+    slugs = set()
+    for item in items:
+        value = item.get(field)
+        values = value if isinstance(value, list) else [value]
+        slugs.update(slug for slug in values if isinstance(slug, str))
+    return slugs
+
+
+class TitleBulkWriter:
+    """
+    Create and update many titles with a fixed number of queries.
+
+    Items with an `id` partially update that title, the others create a
+    new one. Every referenced genre, category and title is loaded with
+    at most one `IN` query per model, new titles are inserted with
+    `bulk_create`, changed ones written with `bulk_update`, and all genre
+    links in one batch, inside a single transaction. Invalid items are
+    reported and skipped, or, with `atomic`, abort the whole batch.
+    """
+
+    def __init__(self, items, context=None, atomic=False, batch_size=None):
+        if not isinstance(items, list):
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Ожидается список произведений.'
+                ]
+            })
+        self.items = items
+        self.context = dict(context or {})
+        self.atomic = atomic
+        self.batch_size = batch_size
+
+    def resolve(self):
+        """
+        Load every referenced object, slugs through the slug caches and
+        titles with one query.
+        """
+        dicts = [item for item in self.items if isinstance(item, dict)]
+        self.context['resolved_slugs'] = {
+            Genre: genre_slugs.resolve(collect_slugs(dicts, 'genre')),
+            Category: category_slugs.resolve(
+                collect_slugs(dicts, 'category')
+            ),
+        }
+        ids = {item['id'] for item in dicts if is_id(item.get('id'))}
+        self.titles = Title.objects.in_bulk(ids) if ids else {}
+
+    def validate(self):
+        """Validate every item, returning `(index, serializer)` pairs."""
+        self.results = [None] * len(self.items)
+        valid = []
+        seen = set()
+        for index, item in enumerate(self.items):
+            instance = None
+            if isinstance(item, dict) and 'id' in item:
+                if is_id(item['id']):
+                    instance = self.titles.get(item['id'])
+                if instance is None or instance.pk in seen:
+                    self.results[index] = {'status': INVALID, 'errors': {
+                        'id': [
+                            'Произведение не найдено.' if instance is None
+                            else 'Произведение уже изменяется в этом запросе.'
+                        ]
+                    }}
+                    continue
+                seen.add(instance.pk)
+            serializer = TitleWriteSerializer(
+                instance, data=item, partial=instance is not None,
+                context=self.context
+            )
+            if serializer.is_valid():
+                valid.append((index, serializer))
+            else:
+                self.results[index] = {
+                    'status': INVALID, 'errors': serializer.errors
+                }
+        return valid
+
+    def save(self):
+        """Write the valid items and return a result per item."""
+        self.resolve()
+        valid = self.validate()
+        self.invalid = len(self.items) - len(valid)
+        if self.atomic and self.invalid:
+            for index, _ in valid:
+                self.results[index] = {'status': SKIPPED}
+            return self.results
+        while True:
+            try:
+                with transaction.atomic():
+                    created, updated = self.write(valid)
+                    transaction.on_commit(
+                        partial(bump_version, TITLE_FACETS)
+                    )
+                break
+            except IntegrityError:
+                # Write the items again without those referring to slugs
+                # deleted since they were resolved.
+                remaining = self.drop_deleted_slugs(valid)
+                if len(remaining) == len(valid):
+                    raise
+                valid = remaining
+            if self.atomic:
+                for index, _ in valid:
+                    self.results[index] = {'status': SKIPPED}
+                return self.results
+        self.report(
+            [(index, title, CREATED) for index, title in created]
+            + [(index, title, UPDATED) for index, title in updated]
+        )
+        return self.results
+
+    def drop_deleted_slugs(self, valid):
+        """
+        After a write failed, mark the items referring to genres or
+        categories deleted since they were resolved as invalid, and
+        return the others.
+        """
+        data = [serializer.validated_data for _, serializer in valid]
+        deleted = find_deleted_slugs(
+            [genre for item in data for genre in item.get('genre', ())],
+            [item.get('category') for item in data]
+        )
+        remaining = []
+        for (index, serializer), item in zip(valid, data):
+            errors = deleted_slug_errors(
+                item.get('genre', ()), [item.get('category')], deleted
+            )
+            if errors:
+                self.results[index] = {'status': INVALID, 'errors': errors}
+                self.invalid += 1
+            else:
+                remaining.append((index, serializer))
+        return remaining
+
+    def write(self, valid):
+        created, updated, links = [], [], {}
+        update_fields = set()
+        for index, serializer in valid:
+            data = dict(serializer.validated_data)
+            genres = data.pop('genre', None)
+            title = serializer.instance or Title()
+            for field, value in data.items():
+                setattr(title, field, value)
+            fill_shadow_fields(title)
+            if serializer.instance is None:
+                created.append((index, title))
+            else:
+                updated.append((index, title))
+                update_fields.update(data)
+            if genres is not None:
+                links[index] = genres
+        self.create_titles([title for _, title in created])
+        if updated:
+            # `bulk_update` skips `auto_now`, genre links change the
+            # title as well.
+            now = timezone.now()
+            for _, title in updated:
+                title.updated_at = now
+            update_fields.add('updated_at')
+            if 'name' in update_fields:
+                update_fields.add('name_folded')
+            Title.objects.bulk_update(
+                [title for _, title in updated],
+                sorted(update_fields),
+                batch_size=self.batch_size
+            )
+        titles = dict(created + updated)
+        TitleGenre.objects.filter(title__in=[
+            title for index, title in updated if index in links
+        ]).delete_links()
+        TitleGenre.objects.bulk_create([
+            TitleGenre(title=titles[index], genre=genre)
+            for index, genres in links.items()
+            for genre in dict.fromkeys(genres)
+        ], batch_size=self.batch_size)
+        return created, updated
+
+    def create_titles(self, titles):
+        if not titles:
+            return
+        Title.objects.bulk_create(titles, batch_size=self.batch_size)
+        if titles[0].pk is None:
+            # SQLite does not return primary keys from bulk inserts. The
+            # insert write-locks the table until the transaction ends and
+            # ids are AUTOINCREMENT, so the newest ids are ours, in order.
+            ids = Title.objects.order_by('-pk').values_list(
+                'pk', flat=True
+            )[:len(titles)]
+            for title, pk in zip(titles, reversed(list(ids))):
+                title.pk = pk
+
+    def report(self, written):
+        """Fill in the results of written titles with their new state."""
+        if not written:
+            return
+        serializer = FastTitleReadSerializer()
+        data = {
+            row['id']: row for row in serializer.serialize_many(
+                serializer.values(Title.objects.filter(
+                    pk__in=[title.pk for _, title, _ in written]
+                ))
+            )
+        }
+        for index, title, status in written:
+            self.results[index] = {'status': status, 'data': data[title.pk]}
@@ -0,0 +1,90 @@
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+
+from api_yamdb.cache_versions import changed_at, model_deletions_name
+
+
+class ConditionalGetMixin:
+    """
+    Strong `ETag` and `Last-Modified` headers on `list` and `retrieve`,
+    and 304 responses to requests whose `If-None-Match` or
+    `If-Modified-Since` still match. The validators come from a single
+    aggregate over the indexed `updated_at` column of the filtered
+    queryset, before anything is serialized: every write moves
+    `updated_at` forward or removes a row, so the row count and the
+    newest change identify the content exactly. Deleted rows cannot
+    date themselves, list `Last-Modified` also covers the last deletion
+    recorded in the cache. `Last-Modified` has a precision of one
+    second, the ETag takes precedence when a client sends both.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def get_validator_queryset(self):
+        """The rows the response is built from, as `get_object` finds them."""
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.action == 'retrieve':
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        return queryset
+
+    def get_validators(self):
+        """
+        The ETag and the Unix time of the last change of the response, or
+        None for an object that does not exist or a malformed lookup.
+        """
+        try:
+            queryset = self.get_validator_queryset()
+            state = queryset.aggregate(
+                count=Count('pk'), updated_at=Max('updated_at')
+            )
+        except (TypeError, ValueError, ValidationError):
+            # A malformed lookup, `get_object` answers it with 404.
+            return None
+        if self.action == 'retrieve' and not state['count']:
+            return None
+        updated_at = state['updated_at']
+        last_modified = updated_at.timestamp() if updated_at else 0
+        if self.action == 'list':
+            last_modified = max(last_modified, changed_at(
+                model_deletions_name(queryset.model)
+            ))
+        etag = hashlib.md5('\n'.join((
+            self.request.build_absolute_uri(),
+            self.request.accepted_media_type,
+            str(state['count']),
+            updated_at.isoformat() if updated_at else '',
+        )).encode()).hexdigest()
+        return quote_etag(etag), int(last_modified)
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        validators = self.get_validators()
+        if validators is None:
+            return handler(request, *args, **kwargs)
+        etag, last_modified = validators
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (
+            status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED
+        ):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
@@ -0,0 +1,37 @@
+from reviews.csv_loader import batches
+from .fast_serializers import FastTitleReadSerializer
+
+# Separator of genre slugs in the CSV `genre` column.
+CSV_LIST_SEPARATOR = '|'
+
+
+def iter_title_chunks(queryset, chunk_size):
+    """
+    Serialize every title of the queryset in lists of `chunk_size`,
+    reading the rows with a server-side iterator and loading genres
+    with one query per chunk, so memory use does not grow with the
+    catalogue.
+    """
+    serializer = FastTitleReadSerializer()
+    rows = serializer.values(queryset).order_by('pk').iterator(
+        chunk_size=chunk_size
+    )
+    for chunk in batches(rows, chunk_size):
+        yield serializer.serialize_many(chunk)
+
+
+def flatten_title(title):
+    """A serialized title as a flat CSV row of slugs."""
+    category = title['category']
+    return {
+        **title,
+        'genre': CSV_LIST_SEPARATOR.join(
+            genre['slug'] for genre in title['genre']
+        ),
+        'category': category['slug'] if category else '',
+    }
+
+
+def iter_flat_title_chunks(queryset, chunk_size):
+    for chunk in iter_title_chunks(queryset, chunk_size):
+        yield [flatten_title(title) for title in chunk]
@@ -0,0 +1,69 @@
+import hashlib
+from urllib.parse import urlencode
+
+from django.db.models import Count, ExpressionWrapper, F, IntegerField
+
+from api_yamdb.settings import FACETS_YEAR_BUCKET_SIZE
+from reviews.models import TitleGenre
+from .filters import CharInFilter
+
+
+def normalize_filter_params(query_params, filterset_class):
+    """
+    Digest of the query parameters understood by the filterset, with
+    list values deduplicated and sorted, so equivalent requests share
+    a cache entry.
+    """
+    items = []
+    for name, filter_ in sorted(filterset_class.base_filters.items()):
+        value = query_params.get(name)
+        if value is None:
+            continue
+        if isinstance(filter_, CharInFilter):
+            value = ','.join(sorted({
+                part.strip() for part in value.split(',') if part.strip()
+            }))
+        items.append((name, value))
+    return hashlib.md5(urlencode(items).encode()).hexdigest()
+
+
+def title_facets(queryset):
+    """
+    Count titles of the queryset per genre slug, category slug and year
+    bucket in three grouped aggregate queries.
+    """
+    title_ids = queryset.order_by().values('pk')
+    genres = TitleGenre.objects.filter(
+        title_id__in=title_ids
+    ).values('genre__slug').annotate(count=Count('pk')).order_by(
+        'genre__slug'
+    )
+    categories = queryset.model.objects.filter(
+        pk__in=title_ids, category__isnull=False
+    ).values('category__slug').annotate(count=Count('pk')).order_by(
+        'category__slug'
+    )
+    years = queryset.model.objects.filter(pk__in=title_ids).annotate(
+        bucket=ExpressionWrapper(
+            F('year') / FACETS_YEAR_BUCKET_SIZE * FACETS_YEAR_BUCKET_SIZE,
+            output_field=IntegerField()
+        )
+    ).values('bucket').annotate(count=Count('pk')).order_by('bucket')
+    return {
+        'genre': [
+            {'slug': row['genre__slug'], 'count': row['count']}
+            for row in genres
+        ],
+        'category': [
+            {'slug': row['category__slug'], 'count': row['count']}
+            for row in categories
+        ],
+        'year': [
+            {
+                'from': row['bucket'],
+                'to': row['bucket'] + FACETS_YEAR_BUCKET_SIZE - 1,
+                'count': row['count'],
+            }
+            for row in years
+        ],
+    }
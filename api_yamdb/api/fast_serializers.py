@@ -0,0 +1,171 @@
+from collections import OrderedDict, defaultdict
+from operator import itemgetter
+
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from api_yamdb.db_router import same_database
+from reviews.models import TitleGenre
+from users.models import MyUser
+from .serializers import (
+    CommentSerializer, ReviewSerializer, TitleReadSerializer
+)
+
+
+class FastReadSerializer:
+    """
+    Read-only serializer building plain ordered dicts from `.values()` rows,
+    bypassing the per-field dispatch of DRF serializers. Its output must
+    render exactly like `serializer_class`.
+
+    Subclasses declare, per serializer field, the `.values()` columns it
+    needs in `field_columns` and how a row turns into the field value in
+    `get_<field>` methods; fields without a getter copy their column.
+    """
+
+    serializer_class = None
+    field_columns = {}
+    always_columns = ('id',)
+
+    def __init__(self, fields=None):
+        declared = self.serializer_class.Meta.fields
+        self.fields = [
+            name for name in declared if fields is None or name in fields
+        ]
+        self.getters = [
+            (name, getattr(self, f'get_{name}', itemgetter(name)))
+            for name in self.fields
+        ]
+
+    def values(self, queryset):
+        """Turn the queryset into `.values()` rows for the rendered fields."""
+        columns = dict.fromkeys(self.always_columns)
+        for name in self.fields:
+            columns.update(
+                dict.fromkeys(self.field_columns.get(name, (name,)))
+            )
+        return queryset.prefetch_related(None).values(*columns)
+
+    def prepare(self, rows):
+        """Load related data for a page of rows in bulk."""
+
+    def to_representation(self, row):
+        return OrderedDict(
+            (name, getter(row)) for name, getter in self.getters
+        )
+
+    def serialize_many(self, rows):
+        rows = list(rows)
+        self.prepare(rows)
+        to_representation = self.to_representation
+        return [to_representation(row) for row in rows]
+
+
+class FastTitleReadSerializer(FastReadSerializer):
+    """Compiled counterpart of `TitleReadSerializer`."""
+
+    serializer_class = TitleReadSerializer
+    field_columns = {
+        'genre': (),
+        'category': ('category__name', 'category__slug'),
+    }
+
+    def prepare(self, rows):
+        self.genres = defaultdict(list)
+        if 'genre' not in self.fields or not rows:
+            return
+        links = TitleGenre.objects.filter(
+            title_id__in=[row['id'] for row in rows]
+        ).order_by('genre__slug').values_list(
+            'title_id', 'genre__name', 'genre__slug'
+        )
+        for title_id, name, slug in links:
+            self.genres[title_id].append(
+                OrderedDict((('name', name), ('slug', slug)))
+            )
+
+    def get_genre(self, row):
+        return self.genres[row['id']]
+
+    def get_category(self, row):
+        if row['category__slug'] is None:
+            return None
+        return OrderedDict((
+            ('name', row['category__name']),
+            ('slug', row['category__slug']),
+        ))
+
+
+class FastPublicationSerializer(FastReadSerializer):
+    """
+    Compiled serializer of objects with an author and a `pub_date`.
+    Usernames are joined when users share the database, and read with a
+    query of their own when they are stored in another one.
+    """
+
+    field_columns = {'author': ('author_id',)}
+    always_columns = ('id', 'pub_date')
+    pub_date_field = serializers.DateTimeField()
+
+    def __init__(self, fields=None):
+        super().__init__(fields)
+        self.authors_joined = same_database(
+            self.serializer_class.Meta.model, MyUser
+        )
+        if self.authors_joined:
+            self.field_columns = {'author': ('author__username',)}
+
+    def prepare(self, rows):
+        self.usernames = {}
+        if 'author' not in self.fields or not rows or self.authors_joined:
+            return
+        self.usernames = dict(MyUser.objects.filter(
+            pk__in={row['author_id'] for row in rows}
+        ).values_list('pk', 'username'))
+
+    def get_author(self, row):
+        if self.authors_joined:
+            return row['author__username']
+        return self.usernames.get(row['author_id'])
+
+    def get_pub_date(self, row):
+        return self.pub_date_field.to_representation(row['pub_date'])
+
+
+class FastReviewSerializer(FastPublicationSerializer):
+    """Compiled counterpart of `ReviewSerializer`."""
+
+    serializer_class = ReviewSerializer
+
+
+class FastCommentSerializer(FastPublicationSerializer):
+    """Compiled counterpart of `CommentSerializer`."""
+
+    serializer_class = CommentSerializer
+
+
+class FastListMixin:
+    """
+    Serve `list` through `fast_serializer_class` when
+    `settings.FAST_READ_SERIALIZERS` is on.
+    """
+
+    fast_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if (
+            not getattr(settings, 'FAST_READ_SERIALIZERS', False)
+            or self.fast_serializer_class is None
+        ):
+            return super().list(request, *args, **kwargs)
+        serializer = self.fast_serializer_class(self.get_rendered_fields())
+        queryset = serializer.values(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                serializer.serialize_many(page)
+            )
+        return Response(serializer.serialize_many(queryset))
@@ -0,0 +1,59 @@
+from itertools import chain
+
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_QUERY_PARAM = 'fields'
+OMIT_QUERY_PARAM = 'omit'
+
+
+def parse_field_list(value):
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def requested_fields(request, available):
+    """
+    Names of the `available` fields selected by `?fields=` and `?omit=`.
+    Only read requests are narrowed, unknown names are ignored.
+    """
+    selected = set(available)
+    if request is None or request.method not in SAFE_METHODS:
+        return selected
+    fields = request.query_params.get(FIELDS_QUERY_PARAM)
+    if fields:
+        selected &= parse_field_list(fields)
+    omit = request.query_params.get(OMIT_QUERY_PARAM)
+    if omit:
+        selected -= parse_field_list(omit)
+    return selected
+
+
+class SparseFieldsetMixin:
+    """Serializer mixin dropping the fields not requested by the client."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = requested_fields(self.context.get('request'), self.fields)
+        for name in set(self.fields) - selected:
+            self.fields.pop(name)
+
+
+class SparseFieldsetViewMixin:
+    """
+    View mixin exposing the fields the response will render, so that
+    `get_queryset` can skip columns and relations nobody asked for.
+    """
+
+    def get_rendered_fields(self):
+        serializer_class = self.get_serializer_class()
+        return requested_fields(self.request, serializer_class.Meta.fields)
+
+    def only_rendered(self, queryset, columns=None, always=('id',)):
+        """
+        Restrict the queryset to the columns of the rendered fields.
+        `columns` maps a field to its model columns where they differ
+        from the field name itself.
+        """
+        columns = columns or {}
+        return queryset.only(*always, *chain.from_iterable(
+            columns.get(name, (name,)) for name in self.get_rendered_fields()
+        ))
@@ -1,23 +1,126 @@
+import operator
+from functools import reduce
+
 import django_filters
+from django.db.models import Exists, OuterRef, Q
+from rest_framework.filters import SearchFilter
+
+from api_yamdb.shadow_fields import casefold, prefix_range, shadow_field_name
+from reviews.models import Category, Genre, Title, TitleGenre
+from reviews.search import search_titles
+
+
+class CaseFoldedSearchFilter(SearchFilter):
+    """
+    Case-insensitive search over the casefolded shadow columns of
+    `search_fields`, so Cyrillic input is folded correctly. Like
+    `SearchFilter`, every term must occur anywhere in one of the fields.
+    With `?search_match=prefix` the whole search string is matched as one
+    prefix instead, answered with an index range scan.
+    """
 
-from reviews.models import Title
+    match_param = 'search_match'
+    PREFIX_MATCH = 'prefix'
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        if not search_fields or not search_terms:
+            return queryset
+        if request.query_params.get(self.match_param) == self.PREFIX_MATCH:
+            prefix = casefold(' '.join(search_terms))
+            return queryset.filter(reduce(operator.or_, (
+                Q(**prefix_range(shadow_field_name(field_name), prefix))
+                for field_name in search_fields
+            )))
+        return queryset.filter(*(
+            reduce(operator.or_, (
+                Q(**{
+                    f'{shadow_field_name(field_name)}__contains':
+                    casefold(term)
+                })
+                for field_name in search_fields
+            ))
+            for term in search_terms
+        ))
+
+
+class CharInFilter(django_filters.BaseInFilter, django_filters.CharFilter):
+    """Comma-separated list of values."""
 
 
 class TitleFilter(django_filters.FilterSet):
     """Custom filter for title view set."""
-    name = django_filters.CharFilter(
-        field_name='name',
-        lookup_expr='icontains'
+    GENRE_MATCH_ANY = 'any'
+    GENRE_MATCH_ALL = 'all'
+    GENRE_MATCH_CHOICES = (
+        (GENRE_MATCH_ANY, GENRE_MATCH_ANY),
+        (GENRE_MATCH_ALL, GENRE_MATCH_ALL),
     )
-    category = django_filters.CharFilter(
-        field_name='category__slug',
-        lookup_expr='icontains'
+
+    NAME_MATCH_PREFIX = 'prefix'
+
+    name = django_filters.CharFilter(method='filter_name')
+    name_match = django_filters.ChoiceFilter(
+        choices=((NAME_MATCH_PREFIX, NAME_MATCH_PREFIX),),
+        method='filter_name_match'
     )
-    genre = django_filters.CharFilter(
-        field_name='genre__slug',
-        lookup_expr='icontains'
+    category = CharInFilter(method='filter_category')
+    genre = CharInFilter(method='filter_genre')
+    genre_match = django_filters.ChoiceFilter(
+        choices=GENRE_MATCH_CHOICES,
+        method='filter_genre_match'
     )
+    search = django_filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
         fields = ['name', 'year', 'genre', 'category']
+
+    def filter_name(self, queryset, name, value):
+        """
+        Case-insensitive substring match, Cyrillic included, or with
+        `name_match=prefix` a prefix match answered by an index range scan.
+        """
+        if self.form.cleaned_data.get('name_match') == self.NAME_MATCH_PREFIX:
+            return queryset.filter(
+                **prefix_range('name_folded', casefold(value))
+            )
+        return queryset.filter(name_folded__contains=casefold(value))
+
+    def filter_name_match(self, queryset, name, value):
+        """Only switches the mode of the `name` filter."""
+        return queryset
+
+    def filter_category(self, queryset, name, value):
+        """Titles in any of the given category slugs."""
+        return queryset.filter(category_id__in=Category.objects.filter(
+            slug__in=value
+        ).values('id'))
+
+    def filter_genre(self, queryset, name, value):
+        """
+        Titles having any (or, with `genre_match=all`, every) of the given
+        genre slugs, tested with EXISTS on the through table, so titles are
+        never duplicated by the join.
+        """
+        slugs = set(value)
+        if self.form.cleaned_data.get('genre_match') == self.GENRE_MATCH_ALL:
+            for slug in slugs:
+                queryset = queryset.filter(Exists(TitleGenre.objects.filter(
+                    title_id=OuterRef('pk'),
+                    genre_id=Genre.objects.filter(slug=slug).values('id')[:1]
+                )))
+            return queryset
+        return queryset.filter(Exists(TitleGenre.objects.filter(
+            title_id=OuterRef('pk'),
+            genre_id__in=Genre.objects.filter(slug__in=slugs).values('id')
+        )))
+
+    def filter_genre_match(self, queryset, name, value):
+        """Only switches the mode of the `genre` filter."""
+        return queryset
+
+    def filter_search(self, queryset, name, value):
+        """Full-text search over title names and descriptions."""
+        return search_titles(queryset, value)
@@ -0,0 +1,76 @@
+import datetime
+from timeit import default_timer
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import FastJSONRenderer, orjson
+
+
+class Command(BaseCommand):
+    """Compare the stdlib and the accelerated JSON renderers."""
+
+    help = (
+        'Render a page of titles with JSONRenderer and FastJSONRenderer '
+        'and report the time per page.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING(
+                'orjson is not installed, FastJSONRenderer uses the stdlib.'
+            ))
+        page = self.build_page(options['page_size'])
+        results = {}
+        for renderer in (JSONRenderer(), FastJSONRenderer()):
+            name = type(renderer).__name__
+            results[name] = self.measure(renderer, page, options['repeat'])
+            self.stdout.write(
+                f'{name}: {results[name] * 1e6:.1f} us per page of '
+                f'{options["page_size"]} titles'
+            )
+        self.stdout.write(self.style.SUCCESS('Speedup: {:.1f}x'.format(
+            results['JSONRenderer'] / results['FastJSONRenderer']
+        )))
+
+    @staticmethod
+    def build_page(size):
+        """A titles page shaped like the API response."""
+        genres = [
+            {'name': f'Жанр {idx}', 'slug': f'genre-{idx}'}
+            for idx in range(3)
+        ]
+        return {
+            'count': size * 10,
+            'next': 'http://testserver/api/v1/titles/?page=2',
+            'previous': None,
+            'results': [
+                {
+                    'id': idx,
+                    'name': f'Произведение {idx}',
+                    'year': 2000 + idx % 20,
+                    'rating': idx % 10 or None,
+                    'description': 'Описание произведения. ' * 10,
+                    'genre': genres,
+                    'category': {'name': 'Книги', 'slug': 'books'},
+                    'pub_date': datetime.datetime(
+                        2021, 1, 1, tzinfo=datetime.timezone.utc
+                    ) + datetime.timedelta(minutes=idx),
+                }
+                for idx in range(size)
+            ],
+        }
+
+    @staticmethod
+    def measure(renderer, data, repeat):
+        """Best time of `repeat` renders."""
+        best = float('inf')
+        for _ in range(repeat):
+            start = default_timer()
+            renderer.render(data)
+            best = min(best, default_timer() - start)
+        return best
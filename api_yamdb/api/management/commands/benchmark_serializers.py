@@ -0,0 +1,85 @@
+from timeit import default_timer
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.fast_serializers import FastTitleReadSerializer
+from api.serializers import TitleReadSerializer
+from reviews.models import Category, Genre, Title, TitleGenre
+
+
+class Command(BaseCommand):
+    """Compare DRF and compiled title serialization per item."""
+
+    help = (
+        'Serialize generated titles with TitleReadSerializer and '
+        'FastTitleReadSerializer and report the time per item. '
+        'The generated data is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.create_titles(options['items'])
+            self.run(options['items'], options['repeat'])
+            transaction.set_rollback(True)
+
+    def create_titles(self, count):
+        category = Category.objects.create(name='Бенчмарк', slug='bench')
+        genres = [
+            Genre.objects.create(name=f'Жанр {idx}', slug=f'bench-{idx}')
+            for idx in range(3)
+        ]
+        Title.objects.bulk_create(
+            Title(
+                name=f'Произведение {idx}',
+                name_folded=f'произведение {idx}',
+                year=2000,
+                description='Описание ' * 20,
+                category=category
+            )
+            for idx in range(count)
+        )
+        # SQLite does not return primary keys from bulk inserts.
+        title_ids = Title.objects.filter(
+            category=category
+        ).values_list('id', flat=True)
+        TitleGenre.objects.bulk_create(
+            TitleGenre(title_id=title_id, genre=genre)
+            for title_id in title_ids for genre in genres
+        )
+
+    def run(self, count, repeat):
+        queryset = Title.objects.filter(category__slug='bench')
+
+        def regular():
+            instances = list(queryset.select_related(
+                'category'
+            ).prefetch_related('genre'))
+            return TitleReadSerializer(instances, many=True).data
+
+        def fast():
+            serializer = FastTitleReadSerializer()
+            return serializer.serialize_many(serializer.values(queryset))
+
+        results = {}
+        for name, func in (('TitleReadSerializer', regular),
+                           ('FastTitleReadSerializer', fast)):
+            best = min(self.measure(func) for _ in range(repeat))
+            results[name] = best
+            self.stdout.write(
+                f'{name}: {best / count * 1e6:.1f} us per item '
+                f'({count} items, best of {repeat})'
+            )
+        self.stdout.write(self.style.SUCCESS('Speedup: {:.1f}x'.format(
+            results['TitleReadSerializer'] / results['FastTitleReadSerializer']
+        )))
+
+    @staticmethod
+    def measure(func):
+        start = default_timer()
+        func()
+        return default_timer() - start
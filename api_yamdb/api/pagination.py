@@ -0,0 +1,158 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination, LimitOffsetPagination, _positive_int
+)
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# Range of the 64-bit integer primary keys a cursor can point past.
+MIN_INTEGER = -2 ** 63
+MAX_INTEGER = 2 ** 63 - 1
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on `(pub_date, id)`, newest first.
+    Every page is an index range scan, so its cost does not depend on
+    how deep the client has scrolled, and no COUNT query is run.
+    """
+
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    default_limit = 10
+    max_limit = 100
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.base_url = request.build_absolute_uri()
+        position, reverse = self.decode_cursor(request)
+
+        if position is not None:
+            pub_date, pk = position
+            if reverse:
+                queryset = queryset.filter(pub_date__gte=pub_date).exclude(
+                    Q(pub_date=pub_date) & Q(pk__lte=pk)
+                )
+            else:
+                queryset = queryset.filter(pub_date__lte=pub_date).exclude(
+                    Q(pub_date=pub_date) & Q(pk__gte=pk)
+                )
+        if reverse:
+            queryset = queryset.order_by('pub_date', 'pk')
+        else:
+            queryset = queryset.order_by('-pub_date', '-pk')
+
+        results = list(queryset[:self.limit + 1])
+        has_more = len(results) > self.limit
+        results = results[:self.limit]
+        if reverse:
+            results.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_limit(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.limit_query_param],
+                strict=True,
+                cutoff=self.max_limit
+            )
+        except (KeyError, ValueError):
+            return self.default_limit
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(
+                self.base_url, self.cursor_query_param
+            )
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, obj, reverse):
+        """
+        Build an opaque cursor link pointing past the given object,
+        a model instance or a `.values()` row.
+        """
+        if isinstance(obj, dict):
+            pub_date, pk = obj['pub_date'], obj['id']
+        else:
+            pub_date, pk = obj.pub_date, obj.pk
+        payload = json.dumps(
+            [pub_date.isoformat(), pk, int(reverse)],
+            separators=(',', ':')
+        )
+        cursor = urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, cursor
+        )
+
+    def decode_cursor(self, request):
+        """Return `((pub_date, id), reverse)` encoded in the request."""
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            raw_date, pk, reverse = json.loads(urlsafe_b64decode(padded))
+            pub_date = parse_datetime(raw_date)
+            if (
+                pub_date is None
+                or not isinstance(pk, int) or isinstance(pk, bool)
+                or not MIN_INTEGER <= pk <= MAX_INTEGER
+            ):
+                raise ValueError
+        except (BinasciiError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        return (pub_date, pk), bool(reverse)
+
+
+class LimitOffsetOrKeysetPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination with an opt-in keyset mode for deep
+    scrolling, enabled with `?pagination=cursor` or a `cursor` parameter.
+    """
+
+    mode_query_param = 'pagination'
+    keyset_pagination_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.keyset_pagination_class.cursor_query_param
+            in request.query_params
+        ):
+            self.keyset = self.keyset_pagination_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
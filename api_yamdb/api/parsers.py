@@ -0,0 +1,27 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from .renderers import FastJSONRenderer, orjson
+
+
+class FastJSONParser(JSONParser):
+    """
+    `JSONParser` decoding UTF-8 bodies with orjson when it is installed.
+    Other charsets and non-strict parsing use the stdlib decoder.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if (
+            orjson is None or not self.strict
+            or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8')
+        ):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
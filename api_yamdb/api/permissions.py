@@ -5,14 +5,15 @@ class IsAdminModeratorAuthorOrReadOnly(permissions.BasePermission):
     """
     Object-level permission to only allow authors of an object,
     admins or moderators to edit it.
-    Assumes the model instance has an `author` attribute.
+    Assumes the model instance has an `author` attribute and compares
+    foreign key ids, so the author row is never loaded for the check.
     """
     def has_object_permission(self, request, views, obj):
         return (
             (request.method in permissions.SAFE_METHODS)
             or request.user.is_admin
             or request.user.is_moderator
-            or obj.author == request.user
+            or obj.author_id == request.user.id
         )
 
 
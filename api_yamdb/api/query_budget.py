@@ -0,0 +1,84 @@
+import logging
+import re
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+QUERY_BUDGET_RAISE = 'raise'
+
+PLACEHOLDER_LIST_RE = re.compile(r'%s(?:\s*,\s*%s)+')
+NUMBER_RE = re.compile(r'\b\d+\b')
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+
+
+def normalize_sql(sql):
+    """Replace literals and placeholder lists so N+1 repeats collapse."""
+    sql = STRING_RE.sub('?', sql)
+    sql = PLACEHOLDER_LIST_RE.sub('...', sql)
+    sql = NUMBER_RE.sub('?', sql)
+    return sql.replace('%s', '?')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in `raise` mode when a request runs more queries than allowed."""
+
+
+class QueryRecorder:
+    """`execute_wrapper` that records the SQL of every executed query."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.statements.append(sql)
+        return execute(sql, params, many, context)
+
+    def __len__(self):
+        return len(self.statements)
+
+    def report(self):
+        """Statements grouped by normalized SQL, most frequent first."""
+        grouped = Counter(normalize_sql(sql) for sql in self.statements)
+        return '\n'.join(
+            f'{count:>4} x {sql}' for sql, count in grouped.most_common()
+        )
+
+
+class QueryBudgetMixin:
+    """
+    Count SQL queries per request and compare them with `query_budget`,
+    a mapping of action (or lower-case HTTP method for plain API views)
+    to the maximum number of queries. Disabled unless
+    `settings.QUERY_BUDGET_MODE` is `log` or `raise`.
+    """
+
+    query_budget = {}
+
+    def dispatch(self, request, *args, **kwargs):
+        mode = getattr(settings, 'QUERY_BUDGET_MODE', None)
+        if not mode:
+            return super().dispatch(request, *args, **kwargs)
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = super().dispatch(request, *args, **kwargs)
+        self.check_query_budget(request, recorder, mode)
+        return response
+
+    def check_query_budget(self, request, recorder, mode):
+        action = getattr(self, 'action', None) or request.method.lower()
+        budget = self.query_budget.get(action)
+        if budget is None or len(recorder) <= budget:
+            return
+        message = (
+            f'Query budget exceeded for {type(self).__name__}.{action}: '
+            f'{len(recorder)} queries, budget {budget}.\n{recorder.report()}'
+        )
+        if mode == QUERY_BUDGET_RAISE:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
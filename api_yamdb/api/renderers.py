@@ -0,0 +1,101 @@
+import csv
+import io
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Characters DRF always escapes so the output stays a JavaScript subset.
+JS_UNSAFE_ESCAPES = (
+    ('\u2028'.encode(), b'\\u2028'),
+    ('\u2029'.encode(), b'\\u2029'),
+)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    `JSONRenderer` encoding with orjson when it is installed, with the
+    same output bytes. Values orjson does not know natively (datetimes,
+    Decimal, lazy translations) go through DRF's encoder. Indented,
+    ASCII-only and non-strict output, as well as anything orjson
+    refuses, fall back to the stdlib encoder.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if (
+            orjson is None or indent is not None
+            or self.ensure_ascii or not self.compact or not self.strict
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        for char, escaped in JS_UNSAFE_ESCAPES:
+            if char in ret:
+                ret = ret.replace(char, escaped)
+        return ret
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Newline-delimited JSON: one compact JSON document per item."""
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        items = data if isinstance(data, list) else [data]
+        json_renderer = FastJSONRenderer()
+        return b''.join(json_renderer.render(item) + b'\n' for item in items)
+
+    def render_stream(self, chunks):
+        """Lazily render an iterable of item lists, one write per list."""
+        for chunk in chunks:
+            yield self.render(chunk)
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    CSV with a header row taken from the keys of the first item.
+    Items are expected to be flat mappings.
+    """
+
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        items = data if isinstance(data, list) else [data]
+        return b''.join(self.render_stream([items]))
+
+    def render_stream(self, chunks):
+        """
+        Lazily render an iterable of item lists, one write per list,
+        reusing a single buffer.
+        """
+        buffer = io.StringIO()
+        writer = None
+        for chunk in chunks:
+            for item in chunk:
+                if writer is None:
+                    writer = csv.DictWriter(buffer, fieldnames=list(item))
+                    writer.writeheader()
+                writer.writerow(item)
+            yield buffer.getvalue().encode(self.charset)
+            buffer.seek(0)
+            buffer.truncate()
@@ -0,0 +1,46 @@
+import hashlib
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from api_yamdb.cache_versions import get_version, model_version_name
+from api_yamdb.settings import LIST_CACHE_TIMEOUT
+
+
+def list_cache_key(request, model):
+    """
+    Cache key of a list response: the version of the listed model and the
+    absolute URL, which pagination links are built from, with its query
+    parameters sorted.
+    """
+    url = '{}?{}'.format(
+        request.build_absolute_uri(request.path),
+        urlencode(sorted(request.query_params.lists()), doseq=True)
+    )
+    return 'list:{}:{}:{}'.format(
+        model._meta.label_lower,
+        get_version(model_version_name(model)),
+        hashlib.md5(url.encode()).hexdigest()
+    )
+
+
+class VersionedListCacheMixin:
+    """
+    Serve `list` responses from the cache. Every write of the listed
+    model moves its version in the cache all workers share, through
+    signals or `load_csv`, so an entry is never served stale and no
+    expiry has to be guessed. Only the data is cached; it is rendered
+    for each request's accepted media type.
+    """
+
+    def list(self, request, *args, **kwargs):
+        key = list_cache_key(request, self.queryset.model)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, LIST_CACHE_TIMEOUT)
+        return response
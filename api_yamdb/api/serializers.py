@@ -1,14 +1,19 @@
+from collections.abc import Mapping
+
 from django.core.mail import send_mail
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.contrib.auth.tokens import default_token_generator
-from django.shortcuts import get_object_or_404
+from django.db import IntegrityError, transaction
 from rest_framework import serializers, status
+from rest_framework.settings import api_settings
 from rest_framework.serializers import ModelSerializer, SlugRelatedField
 
 from reviews.models import Category, Genre, Title, Review, Title, Comment
+from reviews.slugs import category_slugs, genre_slugs
 from api_yamdb.settings import MAX_USERNAME_LENGTH, MAX_EMAILFIELD_LENGTH
 from users.validators import not_equal_me_username_validator
 from users.models import MyUser
+from .fieldsets import SparseFieldsetMixin
 
 
 class SignUpSerializer(serializers.Serializer):
@@ -91,7 +96,7 @@ class CustomTokenObtainSerializer(serializers.Serializer):
     confirmation_code = serializers.CharField()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for receiving and editing user data."""
 
     class Meta:
@@ -138,14 +143,11 @@ class GenreSerializer(ModelSerializer):
         fields = ('name', 'slug')
 
 
-class TitleReadSerializer(ModelSerializer):
+class TitleReadSerializer(SparseFieldsetMixin, ModelSerializer):
     """Title Read Serializer."""
     genre = GenreSerializer(many=True, read_only=True)
     category = CategorySerializer(read_only=True)
-    rating = serializers.IntegerField(
-        required=False,
-        default=None
-    )
+    rating = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Title
@@ -153,17 +155,145 @@ class TitleReadSerializer(ModelSerializer):
                   'description', 'genre', 'category')
 
 
+def slug_values(data, field):
+    """The string slugs submitted for `field`, a single or a list one."""
+    if hasattr(data, 'getlist'):
+        values = data.getlist(field)
+    else:
+        values = data.get(field)
+        if not isinstance(values, list):
+            values = [values]
+    return [value for value in values if isinstance(value, str)]
+
+
+def find_deleted_slugs(genres, categories):
+    """
+    Of the genres and categories resolved from the slug caches, the ones
+    deleted since, by another worker for instance, as `(model, pk)`
+    pairs. The stale caches are dropped.
+    """
+    deleted = set()
+    for model, objects, cache in (
+        (Genre, genres, genre_slugs),
+        (Category, categories, category_slugs),
+    ):
+        pks = {obj.pk for obj in objects if obj is not None}
+        if not pks:
+            continue
+        missing = pks - set(
+            model.objects.filter(pk__in=pks).values_list('pk', flat=True)
+        )
+        if missing:
+            cache.invalidate()
+            deleted.update((model, pk) for pk in missing)
+    return deleted
+
+
+def deleted_slug_errors(genres, categories, deleted):
+    """Validation errors of the genres and categories in `deleted`."""
+    message = SlugRelatedField.default_error_messages['does_not_exist']
+    errors = {}
+    for field, model, objects in (
+        ('genre', Genre, genres),
+        ('category', Category, categories),
+    ):
+        slugs = dict.fromkeys(
+            obj.slug for obj in objects
+            if obj is not None and (model, obj.pk) in deleted
+        )
+        if slugs:
+            errors[field] = [
+                message.format(slug_name='slug', value=slug)
+                for slug in slugs
+            ]
+    return errors
+
+
+def check_deleted_slugs(genres, categories):
+    """
+    Called when a title write failed: raise the validation error of the
+    genres and categories deleted since they were resolved.
+    """
+    errors = deleted_slug_errors(
+        genres, categories, find_deleted_slugs(genres, categories)
+    )
+    if errors:
+        raise serializers.ValidationError(errors)
+
+
+class ResolvedSlugRelatedField(SlugRelatedField):
+    """
+    `SlugRelatedField` taking objects from the `resolved_slugs` context,
+    a `{model: {slug: object}}` mapping filled in advance for all items,
+    instead of querying every slug separately.
+    """
+
+    def to_internal_value(self, data):
+        resolved = self.context.get('resolved_slugs', {}).get(
+            self.get_queryset().model
+        )
+        if resolved is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool) or not isinstance(data, (str, int)):
+            self.fail('invalid')
+        try:
+            return resolved[str(data)]
+        except KeyError:
+            self.fail(
+                'does_not_exist', slug_name=self.slug_field, value=data
+            )
+
+
 class TitleWriteSerializer(ModelSerializer):
     """Title Write serializer."""
-    genre = SlugRelatedField(
+    genre = ResolvedSlugRelatedField(
         slug_field='slug',
         many=True,
         allow_null=False,
         allow_empty=False,
         queryset=Genre.objects.all()
     )
-    category = SlugRelatedField(slug_field='slug',
-                                queryset=Category.objects.all())
+    category = ResolvedSlugRelatedField(slug_field='slug',
+                                        queryset=Category.objects.all())
+
+    def to_internal_value(self, data):
+        """Resolve every referenced slug through the slug caches at once."""
+        if 'resolved_slugs' not in self.context and isinstance(data, Mapping):
+            self.context['resolved_slugs'] = {
+                Genre: genre_slugs.resolve(slug_values(data, 'genre')),
+                Category: category_slugs.resolve(
+                    slug_values(data, 'category')
+                ),
+            }
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        """Create the title and link its genres in one batch."""
+        genres = validated_data.pop('genre')
+        try:
+            with transaction.atomic():
+                title = super().create(validated_data)
+                title.add_genres(genres)
+                title.cache_genres(genres)
+        except IntegrityError:
+            check_deleted_slugs(genres, [validated_data.get('category')])
+            raise
+        return title
+
+    def update(self, instance, validated_data):
+        """Update the title and relink only the changed genres."""
+        genres = validated_data.pop('genre', None)
+        try:
+            with transaction.atomic():
+                instance = super().update(instance, validated_data)
+                if genres is not None:
+                    instance.set_genres(genres)
+        except IntegrityError:
+            check_deleted_slugs(
+                genres or [], [validated_data.get('category')]
+            )
+            raise
+        return instance
 
     def to_representation(self, instance):
         """Customize serializer data for 'genre' and 'category' fields."""
@@ -175,7 +305,7 @@ class TitleWriteSerializer(ModelSerializer):
                   'description', 'genre', 'category')
 
 
-class ReviewSerializer(ModelSerializer):
+class ReviewSerializer(SparseFieldsetMixin, ModelSerializer):
     """Review serializer."""
     author = SlugRelatedField(
         slug_field='username',
@@ -193,24 +323,27 @@ class ReviewSerializer(ModelSerializer):
             'pub_date',
         )
 
-    def validate(self, data):
+    def create(self, validated_data):
         """
-        Validation method to make sure the author
-        has not left the review for this object.
+        Create the review relying on the `title_author_unique` constraint
+        to reject a second review of the same title by the same author.
         """
-        if self.context['request'].method == 'POST':
-            title = get_object_or_404(
-                Title, pk=self.context['view'].kwargs.get('title_id')
-            )
-            author = self.context['request'].user
-            if Review.objects.filter(title_id=title, author=author).exists():
-                raise serializers.ValidationError(
+        try:
+            return super().create(validated_data)
+        except IntegrityError:
+            if not Review.objects.filter(
+                title=validated_data['title'],
+                author=validated_data['author']
+            ).exists():
+                raise
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
                     'Вы уже оставляли отзыв на это произведение.'
-                )
-        return data
+                ]
+            })
 
 
-class CommentSerializer(ModelSerializer):
+class CommentSerializer(SparseFieldsetMixin, ModelSerializer):
     """Comment serializer."""
     author = SlugRelatedField(
         slug_field='username',
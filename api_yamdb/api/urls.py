@@ -6,6 +6,7 @@ from api.views import (
     GenreViewSet,
     TitleViewSet,
     CommentViewSet,
+    ReplicaLagView,
     ReviewViewSet,
     SignUpView,
     CustomTokenObtainView,
@@ -35,4 +36,9 @@ urlpatterns = [
         CustomTokenObtainView.as_view(),
         name='token_obtain'
     ),
+    path(
+        'v1/metrics/replica-lag/',
+        ReplicaLagView.as_view(),
+        name='replica_lag'
+    ),
 ]
@@ -1,20 +1,47 @@
-from django.db.models import Avg
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from django.contrib.auth.tokens import default_token_generator
-from rest_framework import viewsets, status, permissions, filters
+from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.views import APIView
-from rest_framework.filters import SearchFilter
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework_simplejwt.tokens import AccessToken
 
-from reviews.models import Title, Review, Category, Genre
+from api_yamdb.cache_versions import TITLE_FACETS, get_version
+from api_yamdb.db_router import same_database
+from api_yamdb.settings import (
+    FACETS_CACHE_TIMEOUT,
+    TITLES_BULK_BATCH_SIZE,
+    TITLES_BULK_MAX_ITEMS,
+    TITLES_EXPORT_CHUNK_SIZE,
+)
+from reviews.models import Title, Review, Category, Comment, Genre
+from reviews.replicas import replica_lag
 from users.models import MyUser
-from .filters import TitleFilter
+from .bulk import TitleBulkWriter
+from .conditional import ConditionalGetMixin
+from .export import iter_flat_title_chunks, iter_title_chunks
+from .facets import normalize_filter_params, title_facets
+from .fast_serializers import (
+    FastCommentSerializer,
+    FastListMixin,
+    FastReviewSerializer,
+    FastTitleReadSerializer,
+)
+from .fieldsets import SparseFieldsetViewMixin
+from .filters import CaseFoldedSearchFilter, TitleFilter
+from .pagination import LimitOffsetOrKeysetPagination
+from .query_budget import QueryBudgetMixin
+from .renderers import CSVRenderer, NDJSONRenderer
+from .response_cache import VersionedListCacheMixin
 from .permissions import (
     IsAdminModeratorAuthorOrReadOnly, IsAdminOrReadOnly, IsAdmin
 )
@@ -31,11 +58,27 @@ from .serializers import (
     ReviewSerializer,
 )
 
+# Authors stored in another database are read with a query of their own.
+AUTHOR_PREFETCH = Prefetch(
+    'author', queryset=MyUser.objects.only('id', 'username')
+)
+
+
+def load_authors(queryset):
+    """
+    Load the authors of reviews or comments, joined when users share their
+    database. Return the queryset and the columns the author renders from.
+    """
+    if same_database(queryset.model, MyUser):
+        return queryset.select_related('author'), ('author__username',)
+    return queryset.prefetch_related(AUTHOR_PREFETCH), ()
 
-class SignUpView(APIView):
+
+class SignUpView(QueryBudgetMixin, APIView):
     """View class for registering users."""
 
     permission_classes = (permissions.AllowAny,)
+    query_budget = {'post': 5}
 
     def post(self, request):
         """Method of processing 'post' request when registering users."""
@@ -45,10 +88,11 @@ class SignUpView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class CustomTokenObtainView(APIView):
+class CustomTokenObtainView(QueryBudgetMixin, APIView):
     """Custom view class for receiving a token."""
 
     permission_classes = (permissions.AllowAny,)
+    query_budget = {'post': 1}
 
     def post(self, request):
         """Method of processing 'post' request when receiving a token."""
@@ -72,16 +116,29 @@ class CustomTokenObtainView(APIView):
         return Response(token_data, status=status.HTTP_200_OK)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(QueryBudgetMixin, SparseFieldsetViewMixin,
+                  viewsets.ModelViewSet):
     """Viewset for receiving and editing user data."""
 
     queryset = MyUser.objects.all()
     serializer_class = UserSerializer
     permission_classes = (IsAdmin,)
     lookup_field = 'username'
-    filter_backends = (filters.SearchFilter,)
+    filter_backends = (CaseFoldedSearchFilter,)
     search_fields = ('username',)
     http_method_names = ['get', 'post', 'patch', 'delete']
+    query_budget = {
+        'list': 3,
+        'retrieve': 2,
+        'create': 4,
+        # Renames also move `updated_at` of the user's publications.
+        'partial_update': 7,
+        'user_me_get_and_patch': 7,
+    }
+
+    def get_queryset(self):
+        """Fetch only the columns the response renders."""
+        return self.only_rendered(self.queryset)
 
     @action(
         methods=['get', 'patch'],
@@ -104,15 +161,17 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class CategoryViewSet(ModelViewSet):
+class CategoryViewSet(QueryBudgetMixin, VersionedListCacheMixin,
+                      ModelViewSet):
     """Category view set."""
     lookup_field = 'slug'
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (SearchFilter,)
+    filter_backends = (CaseFoldedSearchFilter,)
     search_fields = ('name',)
     http_method_names = ['get', 'post', 'patch', 'delete']
+    query_budget = {'list': 3, 'create': 3, 'destroy': 6}
 
     def retrieve(self, request, *args, **kwargs):
         """Custom get method."""
@@ -124,14 +183,17 @@ class CategoryViewSet(ModelViewSet):
         return Response(status=status.HTTP_405_METHOD_NOT_ALLOWED)
 
 
-class GenreViewSet(ModelViewSet):
+class GenreViewSet(QueryBudgetMixin, VersionedListCacheMixin,
+                   ModelViewSet):
     """Genre View Set."""
     lookup_field = 'slug'
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (SearchFilter,)
+    filter_backends = (CaseFoldedSearchFilter,)
     search_fields = ('name',)
+    # Genre links are read to send their delete signals.
+    query_budget = {'list': 3, 'create': 3, 'destroy': 7}
 
     def retrieve(self, request, *args, **kwargs):
         """Custom get method."""
@@ -142,17 +204,39 @@ class GenreViewSet(ModelViewSet):
         return Response(status=status.HTTP_405_METHOD_NOT_ALLOWED)
 
 
-class TitleViewSet(ModelViewSet):
+class TitleViewSet(QueryBudgetMixin, SparseFieldsetViewMixin,
+                   ConditionalGetMixin, FastListMixin, ModelViewSet):
     """Title View Set."""
     serializer_class = TitleReadSerializer
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    )
+    fast_serializer_class = FastTitleReadSerializer
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre')
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = (DjangoFilterBackend,)
     filterset_fields = ('name', 'year')
     filterset_class = TitleFilter
     http_method_names = ['get', 'post', 'patch', 'delete']
+    query_budget = {
+        'list': 5,
+        'retrieve': 4,
+        'create': 6,
+        'partial_update': 9,
+        'facets': 4,
+        'export': 1,
+    }
+
+    def get_queryset(self):
+        """Fetch only the columns and relations the response renders."""
+        if self.action not in ('list', 'retrieve'):
+            return self.queryset.prefetch_related(None)
+        fields = self.get_rendered_fields()
+        queryset = Title.objects.all()
+        if 'category' in fields:
+            queryset = queryset.select_related('category')
+        if 'genre' in fields:
+            queryset = queryset.prefetch_related('genre')
+        return self.only_rendered(queryset, {'genre': ()})
 
     def get_serializer_class(self):
         """Getting Serializer Class."""
@@ -161,50 +245,193 @@ class TitleViewSet(ModelViewSet):
         else:
             return TitleReadSerializer
 
+    @action(methods=['get'], detail=False, url_path='facets')
+    def facets(self, request):
+        """Title counts per genre, category and year bucket."""
+        cache_key = 'title_facets:{}:{}'.format(
+            get_version(TITLE_FACETS),
+            normalize_filter_params(request.query_params, self.filterset_class)
+        )
+        data = cache.get(cache_key)
+        if data is None:
+            data = title_facets(self.filter_queryset(self.get_queryset()))
+            cache.set(cache_key, data, FACETS_CACHE_TIMEOUT)
+        return Response(data)
+
+    @action(methods=['post'], detail=False, url_path='bulk')
+    def bulk(self, request):
+        """
+        Create titles, or update those given with an `id`, from a list.
+        Invalid items are reported and skipped, unless `?atomic=true`
+        asks to write nothing when any item is invalid. The number of
+        queries grows with the batches written, so it has no budget.
+        """
+        if (
+            isinstance(request.data, list)
+            and len(request.data) > TITLES_BULK_MAX_ITEMS
+        ):
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                f'Не больше {TITLES_BULK_MAX_ITEMS} произведений за запрос.'
+            ]})
+        atomic = request.query_params.get('atomic', '').lower() in (
+            '1', 'true'
+        )
+        writer = TitleBulkWriter(
+            request.data,
+            self.get_serializer_context(),
+            atomic=atomic,
+            batch_size=TITLES_BULK_BATCH_SIZE
+        )
+        results = writer.save()
+        if atomic and writer.invalid:
+            return Response(
+                {'results': results}, status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response({'results': results})
+
+    @action(
+        methods=['get'],
+        detail=False,
+        url_path='export',
+        permission_classes=(IsAdmin,),
+        renderer_classes=(NDJSONRenderer, CSVRenderer)
+    )
+    def export(self, request):
+        """
+        Stream the whole filtered catalogue as NDJSON or, with
+        `?format=csv`, as CSV. Rows are read lazily while the response
+        is sent, so its queries are not part of the query budget.
+        """
+        renderer = request.accepted_renderer
+        chunks = (
+            iter_flat_title_chunks if renderer.format == 'csv'
+            else iter_title_chunks
+        )(self.filter_queryset(Title.objects.all()), TITLES_EXPORT_CHUNK_SIZE)
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type += f'; charset={renderer.charset}'
+        response = StreamingHttpResponse(
+            renderer.render_stream(chunks), content_type=content_type
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="titles.{renderer.format}"'
+        )
+        return response
+
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(QueryBudgetMixin, SparseFieldsetViewMixin,
+                    ConditionalGetMixin, FastListMixin,
+                    viewsets.ModelViewSet):
     """Review View Set."""
     serializer_class = ReviewSerializer
+    fast_serializer_class = FastReviewSerializer
     permission_classes = [IsAuthenticatedOrReadOnly,
                           IsAdminModeratorAuthorOrReadOnly]
-    pagination_class = LimitOffsetPagination
+    pagination_class = LimitOffsetOrKeysetPagination
     ordering = ('-pub_date',)
     http_method_names = ['get', 'post', 'patch', 'delete']
+    query_budget = {
+        'list': 6,
+        'retrieve': 4,
+        'create': 5,
+        'partial_update': 6,
+        'destroy': 6,
+    }
 
     def get_title(self):
-        """Gets the title of the review."""
-        return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
+        """Gets the title of the review, once per request."""
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title.objects.only('pk'), pk=self.kwargs.get('title_id')
+            )
+        return self._title
 
     def get_queryset(self):
         """Gets all the reviews of the specific title."""
-        return self.get_title().reviews.all()
+        if self.action == 'list':
+            queryset = self.get_title().reviews.all()
+        else:
+            queryset = Review.objects.filter(
+                title_id=self.kwargs.get('title_id')
+            )
+        author_columns = ()
+        if (
+            'author' in self.get_rendered_fields()
+            and self.action != 'destroy'
+        ):
+            queryset, author_columns = load_authors(queryset)
+        return self.only_rendered(
+            queryset,
+            {'author': author_columns},
+            always=('id', 'pub_date', 'title', 'author')
+        )
 
     def perform_create(self, serializer):
         """Saves the author of the review as authenticated user."""
         serializer.save(author=self.request.user, title=self.get_title())
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(QueryBudgetMixin, SparseFieldsetViewMixin,
+                     ConditionalGetMixin, FastListMixin,
+                     viewsets.ModelViewSet):
     """Comment View Set."""
     serializer_class = CommentSerializer
+    fast_serializer_class = FastCommentSerializer
     permission_classes = [IsAuthenticatedOrReadOnly,
                           IsAdminModeratorAuthorOrReadOnly]
-    pagination_class = LimitOffsetPagination
+    pagination_class = LimitOffsetOrKeysetPagination
     ordering = ('-pub_date',)
     http_method_names = ['get', 'post', 'patch', 'delete']
+    query_budget = {
+        'list': 6,
+        'retrieve': 4,
+        'create': 3,
+        'partial_update': 4,
+        'destroy': 4,
+    }
 
     def get_review(self):
-        """Gets the review of the comment."""
-        return get_object_or_404(
-            Review,
-            title__id=self.kwargs.get('title_id'),
-            pk=self.kwargs.get('review_id')
-        )
+        """Gets the review of the comment, once per request."""
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review.objects.only('pk'),
+                title__id=self.kwargs.get('title_id'),
+                pk=self.kwargs.get('review_id')
+            )
+        return self._review
 
     def get_queryset(self):
         """Gets all the comments of the specific review."""
-        return self.get_review().comments.all()
+        if self.action == 'list':
+            queryset = self.get_review().comments.all()
+        else:
+            queryset = Comment.objects.filter(
+                review_id=self.kwargs.get('review_id'),
+                review__title_id=self.kwargs.get('title_id')
+            )
+        author_columns = ()
+        if (
+            'author' in self.get_rendered_fields()
+            and self.action != 'destroy'
+        ):
+            queryset, author_columns = load_authors(queryset)
+        return self.only_rendered(
+            queryset,
+            {'author': author_columns},
+            always=('id', 'pub_date', 'review', 'author')
+        )
 
     def perform_create(self, serializer):
         """Saves the author of the comment as authenticated user."""
         serializer.save(author=self.request.user, review=self.get_review())
+
+
+class ReplicaLagView(QueryBudgetMixin, APIView):
+    """Seconds each read replica is behind the primary database."""
+
+    permission_classes = (IsAdmin,)
+
+    def get(self, request):
+        return Response({
+            alias: replica_lag(alias) for alias in settings.DATABASE_REPLICAS
+        })
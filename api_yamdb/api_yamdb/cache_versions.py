@@ -0,0 +1,96 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.checks import Tags, Warning, register
+
+VERSION_KEY_PREFIX = 'version'
+
+CHANGED_AT_KEY_PREFIX = 'changed_at'
+
+TITLE_FACETS = 'title_facets'
+
+# Backends whose entries only the process that wrote them can read.
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+
+def model_version_name(model):
+    """Version of the caches built from the rows of `model`."""
+    return f'model:{model._meta.label_lower}'
+
+
+def model_deletions_name(model):
+    """Change time of the set of `model` rows that were deleted."""
+    return f'deleted:{model._meta.label_lower}'
+
+
+def version_key(name):
+    return f'{VERSION_KEY_PREFIX}:{name}'
+
+
+def initial_version():
+    """
+    Starting value of a version counter. Clock based rather than 1, so a
+    counter lost to eviction or a cache flush never repeats a version
+    that process-local copies may still hold.
+    """
+    return time.time_ns() // 1000
+
+
+def get_version(name):
+    """Current version of a cached data set."""
+    return cache.get_or_set(version_key(name), initial_version, timeout=None)
+
+
+def bump_version(name):
+    """
+    Invalidate every cache entry built with the current version by moving
+    the counter forward. Atomic on backends with atomic `incr`, such as
+    memcached; on the file backend concurrent bumps may move it only once.
+    """
+    try:
+        return cache.incr(version_key(name))
+    except ValueError:
+        version = initial_version()
+        cache.set(version_key(name), version, timeout=None)
+        return version
+
+
+def changed_at_key(name):
+    return f'{CHANGED_AT_KEY_PREFIX}:{name}'
+
+
+def changed_at(name):
+    """
+    Unix time of the last change of a data set. A time lost to eviction
+    or a cache flush is reported, and remembered, as now, so nothing is
+    ever considered older than it is.
+    """
+    return cache.get_or_set(changed_at_key(name), time.time, timeout=None)
+
+
+def mark_changed(name):
+    """Record that a data set changed now."""
+    cache.set(changed_at_key(name), time.time(), timeout=None)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Versions bumped by one worker must reach the others, or they keep
+    serving the entries the write invalidated. A process-local cache is
+    fine for a single process, such as `runserver`.
+    """
+    backend = settings.CACHES['default']['BACKEND']
+    if backend in PROCESS_LOCAL_BACKENDS:
+        return [Warning(
+            f'The default cache {backend} is not shared between processes.',
+            hint=(
+                'Run a single worker process, or use a cache every worker '
+                'reads, such as FileBasedCache on one host or memcached.'
+            ),
+            id='api_yamdb.W001',
+        )]
+    return []
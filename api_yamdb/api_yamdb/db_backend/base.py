@@ -0,0 +1,73 @@
+"""
+SQLite backend tuned for several worker processes sharing one database
+file: readers do not block behind the writer, and writers wait for the
+write lock instead of failing with "database is locked".
+"""
+import random
+import time
+
+from django.db import OperationalError
+from django.db.backends.signals import connection_created
+from django.db.backends.sqlite3 import base
+
+# Applied to every new connection, overridable per database with the
+# `PRAGMAS` key of its settings.
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'busy_timeout': 5000,
+    'synchronous': 'NORMAL',
+    'mmap_size': 128 * 1024 * 1024,
+    'cache_size': -16000,
+}
+# Attempts to take the write lock after the busy timeout ran out, and the
+# base of the exponential backoff between them, in seconds. Overridable
+# with the `WRITE_LOCK_RETRIES` and `WRITE_LOCK_BACKOFF` settings keys.
+WRITE_LOCK_RETRIES = 3
+WRITE_LOCK_BACKOFF = 0.05
+
+
+def is_locked_error(error):
+    return 'locked' in str(error)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def _start_transaction_under_autocommit(self):
+        """
+        Start `atomic` blocks with `BEGIN IMMEDIATE`. A deferred `BEGIN`
+        takes the write lock at the first write; if another connection
+        committed since the transaction first read, SQLite refuses the
+        upgrade at once, ignoring the busy timeout. Taking the lock up
+        front makes writers queue on the busy timeout instead.
+        """
+        retries = self.settings_dict.get(
+            'WRITE_LOCK_RETRIES', WRITE_LOCK_RETRIES
+        )
+        backoff = self.settings_dict.get(
+            'WRITE_LOCK_BACKOFF', WRITE_LOCK_BACKOFF
+        )
+        for attempt in range(retries + 1):
+            try:
+                self.cursor().execute('BEGIN IMMEDIATE')
+                return
+            except OperationalError as error:
+                if attempt == retries or not is_locked_error(error):
+                    raise
+            time.sleep(backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+
+
+def apply_pragmas(sender, connection, **kwargs):
+    """
+    Set the PRAGMAs on the raw connection, so they are not recorded as
+    queries of the request that happened to open it.
+    """
+    pragmas = {
+        **DEFAULT_PRAGMAS, **connection.settings_dict.get('PRAGMAS', {})
+    }
+    for name, value in pragmas.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
+
+
+connection_created.connect(
+    apply_pragmas, sender=DatabaseWrapper, dispatch_uid='sqlite_pragmas'
+)
@@ -0,0 +1,107 @@
+"""
+Database routing. Apps listed in `settings.DATABASE_APPS_MAPPING` live
+in their own database, the others in `default`. Reads of `default` go to
+the replicas of `settings.DATABASE_REPLICAS` during safe-method
+requests; everything else, including management commands, stays on the
+primary.
+"""
+import hashlib
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+PIN_KEY_PREFIX = 'primary_pin'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+read_from_replicas = ContextVar('read_from_replicas', default=False)
+
+
+def replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def app_database(app_label):
+    """Alias of the primary database of an app."""
+    mapping = getattr(settings, 'DATABASE_APPS_MAPPING', {})
+    return mapping.get(app_label, DEFAULT_DB_ALIAS)
+
+
+def same_database(*models):
+    """Whether the models share a primary database, so joins can span them."""
+    return len({app_database(model._meta.app_label) for model in models}) == 1
+
+
+def pin_key(request):
+    """
+    Cache key pinning a client to the primary: its credentials, or its
+    address for anonymous clients.
+    """
+    identity = (
+        request.META.get('HTTP_AUTHORIZATION')
+        or request.META.get('REMOTE_ADDR', '')
+    )
+    digest = hashlib.sha256(identity.encode()).hexdigest()
+    return f'{PIN_KEY_PREFIX}:{digest}'
+
+
+class DatabaseRouter:
+    """
+    Send every app to its database, and reads of `default` to a random
+    replica while replica reads are enabled.
+    """
+
+    def db_for_read(self, model, **hints):
+        database = app_database(model._meta.app_label)
+        if (
+            database == DEFAULT_DB_ALIAS
+            and read_from_replicas.get() and replicas()
+        ):
+            return random.choice(replicas())
+        return database
+
+    def db_for_write(self, model, **hints):
+        # Whatever the request reads after a write must see it.
+        read_from_replicas.set(False)
+        return app_database(model._meta.app_label)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Relations between databases are plain id columns, see
+        # `reviews.models.Review.author`.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema with the data they copy.
+        if db in replicas():
+            return False
+        return db == app_database(app_label)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Enable replica reads for safe-method requests. A client that sent an
+    unsafe request reads from the primary for
+    `settings.DATABASE_REPLICA_PIN_SECONDS`, so it sees its own writes
+    despite replica lag.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replicas():
+            return self.get_response(request)
+        key = pin_key(request)
+        safe = request.method in SAFE_METHODS
+        token = read_from_replicas.set(safe and not cache.get(key))
+        try:
+            response = self.get_response(request)
+        finally:
+            read_from_replicas.reset(token)
+        if not safe:
+            cache.set(
+                key, True, timeout=settings.DATABASE_REPLICA_PIN_SECONDS
+            )
+        return response
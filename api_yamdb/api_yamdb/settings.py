@@ -31,6 +31,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api_yamdb.db_router.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -66,11 +67,68 @@ AUTH_USER_MODEL = 'users.MyUser'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        # SQLite in WAL mode with write transactions that wait for the
+        # write lock, see api_yamdb/db_backend/base.py
+        'ENGINE': 'api_yamdb.db_backend',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        # Seconds a worker keeps its connection, and its PRAGMAs and page
+        # cache, across requests
+        'CONN_MAX_AGE': 60,
+    },
+    # Local copy of default, refreshed by `manage.py sync_replicas`
+    'replica': {
+        'ENGINE': 'api_yamdb.db_backend',
+        'NAME': BASE_DIR / 'db_replica.sqlite3',
+        'CONN_MAX_AGE': 60,
+        'TEST': {'MIRROR': 'default'},
+    },
+    # Users and authentication, used when DATABASE_APPS_MAPPING sends them
+    # here, so signups do not queue on the write lock of reviews
+    'users': {
+        'ENGINE': 'api_yamdb.db_backend',
+        'NAME': BASE_DIR / 'db_users.sqlite3',
+        'CONN_MAX_AGE': 60,
+    },
+}
+
+DATABASE_ROUTERS = ['api_yamdb.db_router.DatabaseRouter']
+
+# Cache versions, facets, replica pins and change times must be seen by
+# every worker, see api_yamdb/cache_versions.py. Files are shared by the
+# workers of one host; use memcached when they run on several hosts. The
+# local-memory cache only suits a single process.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+# Apps stored outside default, by database alias. Set it to
+# USERS_DATABASE_APPS_MAPPING to split users from reviews; apps with
+# relations between them (auth, admin) must share the users database
+
+USERS_DATABASE_APPS_MAPPING = {
+    'users': 'users',
+    'auth': 'users',
+    'contenttypes': 'users',
+    'admin': 'users',
+    'sessions': 'users',
 }
 
+DATABASE_APPS_MAPPING = {}
+
+# Aliases of DATABASES that safe-method requests read from; empty keeps
+# every read on default
+
+DATABASE_REPLICAS = []
+
+# Seconds a client reads from default after a write, to see its own writes
+
+DATABASE_REPLICA_PIN_SECONDS = 10
+
 
 # Password validation
 
@@ -96,6 +154,17 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
+    # Swap for rest_framework.renderers.JSONRenderer and
+    # rest_framework.parsers.JSONParser to use the stdlib json module.
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10
 }
@@ -105,6 +174,24 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Serve list endpoints through the compiled read serializers
+
+FAST_READ_SERIALIZERS = True
+
+# Titles read per query by the streaming catalogue export
+
+TITLES_EXPORT_CHUNK_SIZE = 500
+
+# Limits of the bulk title endpoint: items per request, rows per INSERT
+
+TITLES_BULK_MAX_ITEMS = 5000
+
+TITLES_BULK_BATCH_SIZE = 500
+
+# Per-request SQL query budgets of API views: None, 'log' or 'raise'
+
+QUERY_BUDGET_MODE = None
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
@@ -141,3 +228,11 @@ MAX_STRING_REPRESENTATION_LENGTH = 10
 MAX_RATING_SCORE_VALUE = 10
 
 MIN_RATING_SCORE_VALUE = 1
+
+FACETS_YEAR_BUCKET_SIZE = 10
+
+FACETS_CACHE_TIMEOUT = 60 * 5
+
+# Writes invalidate cached list responses through model versions, the
+# timeout only frees the entries of outdated versions.
+LIST_CACHE_TIMEOUT = 60 * 60 * 24
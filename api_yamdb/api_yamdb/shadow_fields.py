@@ -0,0 +1,62 @@
+SHADOW_FIELD_SUFFIX = '_folded'
+
+# Upper bound of Unicode, appended to a prefix to get the end of its range.
+PREFIX_RANGE_END = '\U0010ffff'
+
+
+def casefold(value):
+    """Normalize a value the way the shadow columns store it."""
+    if value is None:
+        return None
+    return str(value).casefold()
+
+
+def shadow_field_name(field_name):
+    return f'{field_name}{SHADOW_FIELD_SUFFIX}'
+
+
+def fill_shadow_fields(instance):
+    """
+    Set the casefolded shadow columns of a model instance. Call it before
+    `bulk_create`/`bulk_update`, which bypass `save()`.
+    """
+    deferred = instance.get_deferred_fields()
+    for field_name in instance.casefolded_fields:
+        if field_name not in deferred:
+            setattr(
+                instance,
+                shadow_field_name(field_name),
+                casefold(getattr(instance, field_name))
+            )
+
+
+def prefix_range(field_name, prefix):
+    """
+    Lookup kwargs matching values starting with `prefix` as a plain
+    `>= AND <` range, which SQLite answers with an index range scan.
+    """
+    return {
+        f'{field_name}__gte': prefix,
+        f'{field_name}__lt': prefix + PREFIX_RANGE_END,
+    }
+
+
+class CaseFoldedShadowMixin:
+    """
+    Keep `<field>_folded` columns equal to the casefolded value of every
+    field listed in `casefolded_fields`, so case-insensitive lookups
+    (including Cyrillic) can use a plain index.
+    """
+
+    casefolded_fields = ()
+
+    def save(self, *args, **kwargs):
+        fill_shadow_fields(self)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {
+                shadow_field_name(field_name)
+                for field_name in self.casefolded_fields
+                if field_name in update_fields
+            }
+        super().save(*args, **kwargs)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Comment, Review, Category, Genre, Title
+from .models import Comment, Review, Category, Genre, Title, TitleGenre
 
 
 admin.site.empty_value_display = 'Не задано'
@@ -22,6 +22,19 @@ class CommentInline(admin.TabularInline):
     extra = 0
 
 
+class TitleGenreInline(admin.TabularInline):
+
+    model = TitleGenre
+    extra = 0
+
+
+class TitleAdmin(admin.ModelAdmin):
+
+    inlines = (
+        TitleGenreInline,
+    )
+
+
 class ReviewAdmin(admin.ModelAdmin):
 
     inlines = (
@@ -56,4 +69,4 @@ admin.site.register(Review, ReviewAdmin)
 admin.site.register(Comment, CommentAdmin)
 admin.site.register(Category, CategoryAdmin)
 admin.site.register(Genre, GenreAdmin)
-admin.site.register(Title, admin.ModelAdmin)
+admin.site.register(Title, TitleAdmin)
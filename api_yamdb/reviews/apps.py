@@ -1,6 +1,22 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def ensure_title_search(sender, using, **kwargs):
+    """Restore search triggers dropped when SQLite remakes the table."""
+    from django.db import connections
+
+    from .search import install_title_search, title_search_installed
+
+    connection = connections[using]
+    if title_search_installed(connection):
+        install_title_search(connection)
 
 
 class ReviewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reviews'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        post_migrate.connect(ensure_title_search, sender=self)
@@ -0,0 +1,451 @@
+import csv
+import hashlib
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.db import connections, router
+from django.db.models import UniqueConstraint
+
+from api_yamdb.shadow_fields import SHADOW_FIELD_SUFFIX, casefold
+
+INTEGER_TYPES = {
+    'AutoField', 'BigAutoField', 'SmallAutoField', 'BigIntegerField',
+    'IntegerField', 'SmallIntegerField', 'PositiveIntegerField',
+    'PositiveSmallIntegerField', 'PositiveBigIntegerField',
+}
+TEXT_TYPES = {
+    'CharField', 'EmailField', 'SlugField', 'TextField', 'URLField',
+}
+# Types whose database value is also their Python value, so field
+# validators can run on the converted cell.
+VALIDATED_TYPES = INTEGER_TYPES | TEXT_TYPES | {'BooleanField'}
+
+# Settings for the duration of a load, the previous values are restored
+# afterwards. The journal mode is left alone: leaving WAL needs exclusive
+# access, which a database the site is serving never grants, and WAL
+# already makes `synchronous = NORMAL` safe against corruption.
+LOAD_PRAGMAS = {
+    'synchronous': 'NORMAL',
+    'cache_size': -64000,
+    'temp_store': 'MEMORY',
+}
+
+
+def csv_files(base_path):
+    """
+    CSV files of `<n>_<app>/<n>_<model>.csv` layout, in load order, with
+    the table each of them fills.
+    """
+    for directory in sorted(Path(base_path).iterdir()):
+        if not directory.is_dir():
+            continue
+        for path in sorted(directory.glob('*.csv')):
+            yield path, f'{directory.name[2:]}_{path.stem[2:]}'
+
+
+def model_for_table(table):
+    for model in apps.get_models(include_auto_created=True):
+        if model._meta.db_table == table:
+            return model
+    raise LookupError(f'No model uses the table "{table}".')
+
+
+def model_connection(model):
+    """Connection of the database `model` is written to."""
+    return connections[router.db_for_write(model)]
+
+
+def dependency_order(files):
+    """
+    Order `(path, table)` pairs so that every table comes after the
+    tables its foreign keys point to, keeping the given order otherwise.
+    """
+    models = {table: model_for_table(table) for _, table in files}
+    loaded = {model: table for table, model in models.items()}
+    pending = list(files)
+    ordered = []
+    placed = set()
+    while pending:
+        for item in pending:
+            model = models[item[1]]
+            targets = {
+                field.related_model for field in model._meta.concrete_fields
+                if field.is_relation and field.related_model is not model
+                and field.related_model in loaded
+            }
+            if all(loaded[target] in placed for target in targets):
+                break
+        else:
+            raise ValueError(
+                'Circular foreign keys between tables: '
+                + ', '.join(table for _, table in pending)
+            )
+        pending.remove(item)
+        ordered.append(item)
+        placed.add(item[1])
+    return ordered
+
+
+def internal_type(field):
+    if field.is_relation:
+        return field.target_field.get_internal_type()
+    return field.get_internal_type()
+
+
+def integer_converter(field, index, connection, empty):
+    def convert(row):
+        value = row[index]
+        return int(value) if value != '' else empty
+    return convert
+
+
+def boolean_converter(field, index, connection, empty):
+    def convert(row):
+        value = row[index]
+        if value == '':
+            return empty
+        return value.lower() in ('1', 'true')
+    return convert
+
+
+def generic_converter(field, index, connection, empty):
+    def convert(row):
+        value = row[index]
+        if value == '':
+            return empty
+        return field.get_db_prep_save(field.to_python(value), connection)
+    return convert
+
+
+def datetime_converter(field, index, connection, empty):
+    """
+    Store aware ISO 8601 values as naive UTC text, the way Django adapts
+    them on SQLite, without its per-value settings lookups.
+    """
+    generic = generic_converter(field, index, connection, empty)
+    if connection.vendor != 'sqlite':
+        return generic
+
+    def convert(row):
+        try:
+            value = datetime.fromisoformat(row[index])
+        except ValueError:
+            return generic(row)
+        if value.tzinfo is None:
+            return generic(row)
+        return str(value.astimezone(timezone.utc).replace(tzinfo=None))
+    return convert
+
+
+CONVERTERS = {
+    **dict.fromkeys(INTEGER_TYPES, integer_converter),
+    'BooleanField': boolean_converter,
+    'DateTimeField': datetime_converter,
+}
+
+
+def column_converter(field, index, connection):
+    """
+    Build the function turning a CSV row into the database value of
+    `field`, read from cell `index`. Empty cells become NULL or the
+    field default.
+    """
+    field_type = internal_type(field)
+    if field_type in TEXT_TYPES and not field.null:
+        return lambda row: row[index]
+    empty = None if field.null else field.get_db_prep_save(
+        field.get_default(), connection
+    )
+    factory = CONVERTERS.get(field_type, generic_converter)
+    return factory(field, index, connection, empty)
+
+
+class TableLoader:
+    """
+    Mapping of the CSV columns of one file onto the table of `model`,
+    computed once from the header. Columns missing from the file get
+    their default, or the load time for `auto_now` and `auto_now_add`
+    ones, casefolded shadow columns follow their source column.
+    """
+
+    def __init__(self, model, header, connection):
+        self.model = model
+        self.connection = connection
+        self.table = model._meta.db_table
+        self.header = header
+        positions = {name: index for index, name in enumerate(header)}
+        casefolded = getattr(model, 'casefolded_fields', ())
+        self.fields = model._meta.concrete_fields
+        self.columns = []
+        self.converters = []
+        for field in self.fields:
+            self.columns.append(field.column)
+            self.converters.append(self.converter(
+                field, positions, casefolded, connection
+            ))
+        quote_name = connection.ops.quote_name
+        self.sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            quote_name(self.table),
+            ', '.join(quote_name(column) for column in self.columns),
+            ', '.join(['%s'] * len(self.columns))
+        )
+        # Columns filled from the file and modification times; defaults
+        # of the other columns must not overwrite existing rows, nor the
+        # file the ratings maintained from the reviews.
+        derived = getattr(model, 'RATING_FIELDS', ())
+        updated = [
+            quote_name(field.column) for field in model._meta.concrete_fields
+            if not field.primary_key and field.name not in derived and (
+                self.from_file(field, positions)
+                or getattr(field, 'auto_now', False)
+            )
+        ]
+        self.validated = [
+            (index, field) for index, field in enumerate(self.fields)
+            if field.validators and internal_type(field) in VALIDATED_TYPES
+            and self.from_file(field, positions)
+        ]
+        self.upsert_sql = '{} ON CONFLICT ({}) DO {}'.format(
+            self.sql,
+            quote_name(model._meta.pk.column),
+            'UPDATE SET ' + ', '.join(
+                f'{column} = excluded.{column}' for column in updated
+            ) if updated else 'NOTHING'
+        )
+
+    @staticmethod
+    def from_file(field, positions):
+        source = field.name[:-len(SHADOW_FIELD_SUFFIX)]
+        return any(name in positions for name in (
+            field.column, field.name,
+            source if field.name.endswith(SHADOW_FIELD_SUFFIX) else None
+        ))
+
+    @staticmethod
+    def converter(field, positions, casefolded, connection):
+        for name in (field.column, field.name):
+            if name in positions:
+                return column_converter(field, positions[name], connection)
+        source = field.name[:-len(SHADOW_FIELD_SUFFIX)]
+        if field.name.endswith(SHADOW_FIELD_SUFFIX) and source in casefolded:
+            index = positions.get(source)
+            if index is not None:
+                return lambda row: casefold(row[index])
+        if getattr(field, 'auto_now', False) or getattr(
+                field, 'auto_now_add', False):
+            default = datetime.now(timezone.utc)
+        else:
+            default = field.get_default()
+        default = field.get_db_prep_save(default, connection)
+        return lambda row: default
+
+    def convert(self, row):
+        return [convert(row) for convert in self.converters]
+
+    def convert_checked(self, row):
+        """
+        Convert a row and check it against the field constraints that
+        need no database access: types, NOT NULL and field validators.
+        Return the values, or None and the reason the row is invalid.
+        """
+        if len(row) != len(self.header):
+            return None, (
+                f'{len(row)} cells, the header has {len(self.header)}'
+            )
+        values = []
+        for field, convert in zip(self.fields, self.converters):
+            try:
+                value = convert(row)
+            except (TypeError, ValueError, ValidationError) as error:
+                return None, f'{field.column}: {error_message(error)}'
+            if value is None and not field.null:
+                return None, f'{field.column}: empty value is not allowed'
+            values.append(value)
+        for index, field in self.validated:
+            if values[index] is None:
+                continue
+            try:
+                field.run_validators(values[index])
+            except ValidationError as error:
+                return None, f'{field.column}: {error_message(error)}'
+        return values, None
+
+
+def error_message(error):
+    if isinstance(error, ValidationError):
+        return ' '.join(error.messages)
+    return str(error)
+
+
+class ConstraintChecker:
+    """
+    Check converted rows of a table against its foreign keys and unique
+    constraints with in-memory sets of the keys already in the database,
+    loaded once per file, and of the keys seen in the file so far.
+    """
+
+    def __init__(self, loader, check_existing=True):
+        model = loader.model
+        positions = {column: i for i, column in enumerate(loader.columns)}
+        self.foreign_keys = [
+            (positions[field.column], field.column, set(
+                field.related_model._base_manager.values_list(
+                    field.target_field.attname, flat=True
+                )
+            ))
+            for field in loader.fields if field.is_relation
+        ]
+        self.unique = []
+        for fields in unique_field_sets(model):
+            columns = tuple(field.column for field in fields)
+            taken = set()
+            if check_existing:
+                taken = set(model._base_manager.values_list(
+                    *(field.attname for field in fields)
+                ))
+            self.unique.append((
+                tuple(positions[column] for column in columns),
+                ', '.join(columns),
+                taken
+            ))
+
+    def check(self, values):
+        """Return why the row breaks a constraint, or None."""
+        for index, column, existing in self.foreign_keys:
+            value = values[index]
+            if value is not None and value not in existing:
+                return f'{column}: {value} does not exist'
+        keys = []
+        for indexes, columns, taken in self.unique:
+            key = tuple(values[index] for index in indexes)
+            if None in key:
+                continue
+            if key in taken:
+                return f'{columns}: duplicate value'
+            keys.append((taken, key))
+        for taken, key in keys:
+            taken.add(key)
+        return None
+
+
+def dangling_references(model):
+    """
+    Yield the foreign keys of `model` without a database constraint, such
+    as references to another database, with the referenced keys missing
+    from their target table.
+    """
+    for field in model._meta.concrete_fields:
+        if not field.is_relation or field.db_constraint:
+            continue
+        referenced = set(model._base_manager.filter(**{
+            f'{field.attname}__isnull': False
+        }).values_list(field.attname, flat=True).distinct())
+        referenced -= set(field.related_model._base_manager.values_list(
+            field.target_field.attname, flat=True
+        ))
+        if referenced:
+            yield field, sorted(referenced)
+
+
+def unique_field_sets(model):
+    """Field tuples of every unconditional unique constraint of a model."""
+    opts = model._meta
+    field_sets = [(field,) for field in opts.concrete_fields if field.unique]
+    names = list(opts.unique_together) + [
+        constraint.fields for constraint in opts.constraints
+        if isinstance(constraint, UniqueConstraint)
+        and constraint.condition is None
+    ]
+    for together in names:
+        field_sets.append(tuple(opts.get_field(name) for name in together))
+    return field_sets
+
+
+# Table loaders built in a worker process, by table and CSV header.
+worker_loaders = {}
+
+
+def init_worker():
+    """Set up Django in pool processes that do not inherit it."""
+    if not apps.ready:
+        import django
+        django.setup()
+
+
+def convert_batch(table, header, rows, checked=False):
+    """
+    Convert raw CSV rows of `table` into insert parameters, or with
+    `checked` into `convert_checked` results. Runs in a process pool, so
+    only plain lists cross the process boundary.
+    """
+    key = (table, tuple(header))
+    loader = worker_loaders.get(key)
+    if loader is None:
+        model = model_for_table(table)
+        loader = worker_loaders[key] = TableLoader(
+            model, header, model_connection(model)
+        )
+    if checked:
+        return [loader.convert_checked(row) for row in rows]
+    return [loader.convert(row) for row in rows]
+
+
+@contextmanager
+def open_csv(path):
+    """Header and a lazy row iterator of a CSV file."""
+    with open(path, encoding='utf-8', newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        yield next(reader, None), reader
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def batch_sha256(rows):
+    """Hash of raw CSV rows joined by the ASCII unit and record separators."""
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update('\x1f'.join(row).encode())
+        digest.update(b'\x1e')
+    return digest.hexdigest()
+
+
+def batches(iterable, size):
+    iterator = iter(iterable)
+    batch = list(islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, size))
+
+
+@contextmanager
+def sqlite_pragmas(connection, pragmas):
+    """
+    Apply SQLite PRAGMAs for the duration of the block, restoring the
+    previous values afterwards. Must be entered outside a transaction,
+    where `synchronous` can change.
+    """
+    if connection.vendor != 'sqlite':
+        yield
+        return
+    with connection.cursor() as cursor:
+        previous = {}
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}')
+            previous[name] = cursor.fetchone()[0]
+            cursor.execute(f'PRAGMA {name} = {value}')
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            for name, value in previous.items():
+                cursor.execute(f'PRAGMA {name} = {value}')
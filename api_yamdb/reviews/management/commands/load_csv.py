@@ -0,0 +1,357 @@
+import csv
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from timeit import default_timer
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connections, router, transaction
+from django.utils import timezone
+
+from api_yamdb.cache_versions import (
+    TITLE_FACETS, bump_version, model_version_name
+)
+from reviews.csv_loader import (
+    LOAD_PRAGMAS, ConstraintChecker, TableLoader, batch_sha256, batches,
+    convert_batch, csv_files, dangling_references, dependency_order,
+    file_sha256, init_worker, model_connection, model_for_table, open_csv,
+    sqlite_pragmas
+)
+from reviews.models import (
+    Category, Comment, Genre, LoadedCSVFile, Review, Title, TitleGenre
+)
+from reviews.slugs import CATEGORY_SLUGS, GENRE_SLUGS
+from users.models import MyUser
+
+LOAD_ERRORS = (DatabaseError, IndexError, ValidationError, ValueError)
+
+# Models rendered inside the responses of others. Rows loaded in bulk are
+# not tracked one by one, so loading them moves `updated_at` of every row
+# of the models rendering them.
+RENDERED_IN = {
+    Category: (Title,),
+    Genre: (Title,),
+    TitleGenre: (Title,),
+    MyUser: (Review, Comment),
+}
+
+
+class RejectBudgetExceeded(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    """Load the CSV fixtures into the database in bulk."""
+
+    help = (
+        'Stream every <n>_<app>/<n>_<model>.csv file under --path into '
+        'its table with batched inserts, in foreign key order and a '
+        'single transaction, then recompute the title ratings.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=settings.BASE_DIR / 'static' / 'data',
+            help='Directory with the numbered app directories of CSV files.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Number of rows inserted per executemany call.'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help=(
+                'Processes converting CSV rows into column values. With '
+                'more than one, batches are converted in a process pool '
+                'while this process only reads and inserts.'
+            )
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help=(
+                'Skip files and row batches whose content hash matches the '
+                'previous load and upsert the rest by primary key. Batches '
+                'are compared by position, so a row inserted or removed in '
+                'the middle of a file rewrites every batch after it; append '
+                'new rows at the end. Rows removed from a file are not '
+                'deleted.'
+            )
+        )
+        parser.add_argument(
+            '--reject-file',
+            help=(
+                'Validate every row against the model constraints, write '
+                'invalid rows with the reason to this CSV file and commit '
+                'the valid rows batch by batch instead of all or nothing.'
+            )
+        )
+        parser.add_argument(
+            '--max-rejects',
+            type=int,
+            default=100,
+            help='Abort a --reject-file load after this many rejected rows.'
+        )
+
+    def handle(self, *args, **options):
+        for option in ('batch_size', 'workers'):
+            if options[option] < 1:
+                raise CommandError(
+                    f'--{option.replace("_", "-")} must be a positive '
+                    'integer.'
+                )
+        self.options = options
+        self.tolerant = bool(options['reject_file'])
+        self.rejected = 0
+        self.loaded_models = set()
+        started = default_timer()
+        try:
+            files = dependency_order(list(csv_files(options['path'])))
+            with ExitStack() as stack:
+                self.enter_contexts(stack, files)
+                total = sum(
+                    self.load_file(path, table) for path, table in files
+                )
+                self.finish()
+        except RejectBudgetExceeded:
+            self.finish()
+            raise CommandError(
+                f'More than {options["max_rejects"]} rows rejected, load '
+                'aborted. Batches written before stay committed, see '
+                f'{options["reject_file"]}.'
+            )
+        except (DatabaseError, LookupError, OSError, ValueError) as error:
+            raise CommandError(f'Nothing was loaded: {error}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Loaded {total} rows in {default_timer() - started:.2f}s.'
+        ))
+        if self.rejected:
+            self.stdout.write(self.style.WARNING(
+                f'Rejected {self.rejected} rows, see '
+                f'{options["reject_file"]}.'
+            ))
+
+    def enter_contexts(self, stack, files):
+        self.pool = None
+        if self.options['workers'] > 1:
+            self.pool = stack.enter_context(ProcessPoolExecutor(
+                max_workers=self.options['workers'], initializer=init_worker
+            ))
+        # Every database the files are loaded into, and the one of the
+        # load state.
+        databases = dict.fromkeys(
+            [router.db_for_write(LoadedCSVFile)] + [
+                router.db_for_write(model_for_table(table))
+                for _, table in files
+            ]
+        )
+        for using in databases:
+            stack.enter_context(sqlite_pragmas(
+                connections[using], LOAD_PRAGMAS
+            ))
+        if self.tolerant:
+            rejects = stack.enter_context(open(
+                self.options['reject_file'], 'w', encoding='utf-8',
+                newline=''
+            ))
+            self.rejects = csv.writer(rejects)
+            self.rejects.writerow(['file', 'record', 'reason', 'cells'])
+        else:
+            for using in databases:
+                stack.enter_context(transaction.atomic(using=using))
+
+    def finish(self):
+        """Bring the derived data in line with what was loaded."""
+        call_command('recompute_ratings', stdout=self.stdout)
+        now = timezone.now()
+        for model in {
+            model for loaded in self.loaded_models
+            for model in RENDERED_IN.get(loaded, ())
+        }:
+            model.objects.update(updated_at=now)
+        names = [TITLE_FACETS, GENRE_SLUGS, CATEGORY_SLUGS] + [
+            model_version_name(model) for model in self.loaded_models
+        ]
+        for name in names:
+            transaction.on_commit(partial(bump_version, name))
+
+    def load_file(self, path, table):
+        """Load one file, return the number of rows written."""
+        started = default_timer()
+        name = f'{path.parent.name}/{path.name}'
+        sha256 = file_sha256(path)
+        state = LoadedCSVFile.objects.filter(path=name).first()
+        previous = []
+        if self.options['incremental'] and state is not None:
+            if state.sha256 == sha256:
+                self.stdout.write(f'{table}: unchanged, skipped')
+                return 0
+            if state.batch_size == self.options['batch_size']:
+                previous = state.batch_hashes
+        hashes = []
+        with open_csv(path) as (header, rows):
+            if header is None:
+                return 0
+            model = model_for_table(table)
+            self.loaded_models.add(model)
+            loader = TableLoader(model, header, model_connection(model))
+            raw_batches = self.changed_batches(
+                batches(rows, self.options['batch_size']), previous, hashes
+            )
+            converted = self.convert(loader, raw_batches)
+            if self.tolerant:
+                count = self.write_valid(path, loader, converted, hashes)
+            else:
+                count = self.write(path, loader, converted)
+                self.check_references(path, model)
+        LoadedCSVFile.objects.update_or_create(path=name, defaults={
+            # Files with rejected rows are never skipped as unchanged.
+            'sha256': sha256 if all(hashes) else '',
+            'batch_size': self.options['batch_size'],
+            'batch_hashes': hashes,
+        })
+        elapsed = default_timer() - started
+        self.stdout.write(
+            f'{table}: {count} rows in {elapsed:.2f}s '
+            f'({count / elapsed if elapsed else 0:.0f} rows/s)'
+        )
+        return count
+
+    @staticmethod
+    def changed_batches(raw_batches, previous, hashes):
+        """
+        Yield `(number, batch)` for the batches whose hash differs from
+        the one at the same position in `previous`, collecting every hash
+        into `hashes`.
+        """
+        for number, batch in enumerate(raw_batches):
+            digest = batch_sha256(batch)
+            hashes.append(digest)
+            if number >= len(previous) or previous[number] != digest:
+                yield number, batch
+
+    def convert(self, loader, raw_batches):
+        """
+        Yield `(number, batch, converted)` in file order, converting in
+        the pool when there is one. At most two batches per worker are
+        in flight, so memory stays bounded.
+        """
+        if self.pool is None:
+            convert = (
+                loader.convert_checked if self.tolerant else loader.convert
+            )
+            for number, batch in raw_batches:
+                yield number, batch, [convert(row) for row in batch]
+            return
+        pending = deque()
+        for number, batch in raw_batches:
+            pending.append((number, batch, self.pool.submit(
+                convert_batch, loader.table, loader.header, batch,
+                self.tolerant
+            )))
+            if len(pending) >= self.options['workers'] * 2:
+                number, batch, future = pending.popleft()
+                yield number, batch, future.result()
+        while pending:
+            number, batch, future = pending.popleft()
+            yield number, batch, future.result()
+
+    def insert_sql(self, loader):
+        if self.options['incremental']:
+            return loader.upsert_sql
+        return loader.sql
+
+    def write(self, path, loader, converted):
+        sql = self.insert_sql(loader)
+        count = 0
+        try:
+            with loader.connection.cursor() as cursor:
+                for _, _, params in converted:
+                    cursor.executemany(sql, params)
+                    count += len(params)
+        except LOAD_ERRORS as error:
+            raise ValueError(f'{path.name}, rows after {count}: {error}')
+        return count
+
+    def write_valid(self, path, loader, converted, hashes):
+        """
+        Write the rows passing every check, one transaction per batch,
+        and reject the others.
+        """
+        checker = ConstraintChecker(
+            loader, check_existing=not self.options['incremental']
+        )
+        sql = self.insert_sql(loader)
+        batch_size = self.options['batch_size']
+        count = 0
+        for number, batch, results in converted:
+            valid = []
+            rejected = []
+            for offset, (values, reason) in enumerate(results):
+                reason = reason or checker.check(values)
+                if reason is None:
+                    valid.append((offset, values))
+                else:
+                    rejected.append((offset, reason))
+            refused = self.insert_batch(loader.connection, sql, valid)
+            count += len(valid) - len(refused)
+            rejected.extend(refused)
+            if rejected:
+                hashes[number] = ''
+                self.reject(path, number * batch_size, batch, rejected)
+        return count
+
+    @staticmethod
+    def check_references(path, model):
+        """
+        Check the references no database constraint checks, such as
+        those to another database.
+        """
+        for field, missing in dangling_references(model):
+            raise ValueError(
+                f'{path.name}: {field.column} references missing rows '
+                f'{", ".join(map(str, missing[:10]))}'
+            )
+
+    @staticmethod
+    def insert_batch(connection, sql, valid):
+        """
+        Insert the rows in one statement, or row by row when the database
+        still refuses the batch. Return the `(offset, reason)` of the
+        rows it refused.
+        """
+        try:
+            with transaction.atomic(using=connection.alias), \
+                    connection.cursor() as cursor:
+                cursor.executemany(sql, [values for _, values in valid])
+            return []
+        except DatabaseError:
+            pass
+        refused = []
+        for offset, values in valid:
+            try:
+                with transaction.atomic(using=connection.alias), \
+                        connection.cursor() as cursor:
+                    cursor.execute(sql, values)
+            except DatabaseError as error:
+                refused.append((offset, str(error)))
+        return refused
+
+    def reject(self, path, start, batch, rejected):
+        for offset, reason in sorted(rejected):
+            self.rejects.writerow([
+                f'{path.parent.name}/{path.name}', start + offset + 1,
+                reason, *batch[offset]
+            ])
+        self.rejected += len(rejected)
+        if self.rejected > self.options['max_rejects']:
+            raise RejectBudgetExceeded
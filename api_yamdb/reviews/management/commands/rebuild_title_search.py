@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from reviews.search import install_title_search, supports_title_search
+
+
+class Command(BaseCommand):
+    """Rebuild the full-text search index of titles in bulk."""
+
+    help = (
+        'Create the FTS5 title search index and its triggers if missing '
+        'and rebuild it from the titles table.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Database alias to rebuild the index in.'
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if not supports_title_search(connection):
+            raise CommandError(
+                'Title full-text search requires the SQLite backend.'
+            )
+        install_title_search(connection, rebuild=True)
+        self.stdout.write(self.style.SUCCESS('Title search index rebuilt.'))
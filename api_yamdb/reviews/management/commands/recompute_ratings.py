@@ -0,0 +1,86 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    """Verify stored title ratings against reviews and repair drift."""
+
+    help = (
+        'Recompute rating_sum, review_count and rating of every title '
+        'from its reviews and repair the titles that drifted.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report drifted titles, exit with an error if any.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of titles read and updated per batch.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be a positive integer.')
+        if options['check']:
+            drifted = self.find_drifted(batch_size)
+            if drifted:
+                raise CommandError(
+                    'Drifted titles: '
+                    + ', '.join(str(title.pk) for title in drifted)
+                )
+            return
+        # The aggregates are read in the transaction writing the repair,
+        # which holds the write lock from its `BEGIN IMMEDIATE`: no review
+        # written in between can be overwritten.
+        with transaction.atomic():
+            drifted = self.find_drifted(batch_size)
+            Title.objects.bulk_update(
+                drifted,
+                ('rating_sum', 'review_count', 'rating', 'updated_at'),
+                batch_size=batch_size
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Repaired {len(drifted)} titles.'
+        ))
+
+    def find_drifted(self, batch_size):
+        """Drifted titles, set to the rating of their reviews."""
+        actual = Title.objects.order_by().annotate(
+            actual_sum=Coalesce(Sum('reviews__score'), 0),
+            actual_count=Count('reviews')
+        ).values_list(
+            'pk', 'rating_sum', 'review_count', 'rating',
+            'actual_sum', 'actual_count'
+        )
+        drifted = []
+        checked = 0
+        now = timezone.now()
+        for (pk, rating_sum, review_count, rating,
+             actual_sum, actual_count) in actual.iterator(
+                 chunk_size=batch_size):
+            checked += 1
+            actual_rating = Title.calculate_rating(actual_sum, actual_count)
+            if (rating_sum, review_count, rating) != (
+                    actual_sum, actual_count, actual_rating):
+                drifted.append(Title(
+                    pk=pk,
+                    rating_sum=actual_sum,
+                    review_count=actual_count,
+                    rating=actual_rating,
+                    updated_at=now
+                ))
+        self.stdout.write(
+            f'Checked {checked} titles, {len(drifted)} drifted.'
+        )
+        return drifted
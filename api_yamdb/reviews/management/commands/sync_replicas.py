@@ -0,0 +1,59 @@
+import time
+from timeit import default_timer
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from reviews.replicas import replica_lag, sync_replica
+
+
+class Command(BaseCommand):
+    """Refresh the SQLite read replicas from the primary database."""
+
+    help = (
+        'Copy the primary database into every replica of '
+        'DATABASE_REPLICAS with the SQLite online backup API, once or '
+        'every --interval seconds.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            action='append',
+            dest='databases',
+            help='Replica alias to sync, repeatable. Defaults to all.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Keep syncing with this many seconds between copies.'
+        )
+
+    def handle(self, *args, **options):
+        aliases = options['databases'] or settings.DATABASE_REPLICAS
+        if not aliases:
+            raise CommandError('No replicas in DATABASE_REPLICAS.')
+        unknown = set(aliases) - set(settings.DATABASES)
+        if unknown:
+            raise CommandError(
+                f'Unknown databases: {", ".join(sorted(unknown))}.'
+            )
+        while True:
+            for alias in aliases:
+                self.sync(alias)
+            if options['interval'] <= 0:
+                return
+            time.sleep(options['interval'])
+
+    def sync(self, alias):
+        started = default_timer()
+        try:
+            sync_replica(alias)
+        except (DatabaseError, ValueError) as error:
+            raise CommandError(f'Sync of "{alias}" failed: {error}')
+        self.stdout.write(
+            f'{alias}: synced in {default_timer() - started:.2f}s, '
+            f'lag {replica_lag(alias):.2f}s'
+        )
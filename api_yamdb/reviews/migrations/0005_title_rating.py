@@ -0,0 +1,43 @@
+# Generated by Django 3.2 on 2026-10-18 16:38
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_ratings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    titles = Title.objects.annotate(
+        actual_sum=Sum('reviews__score'),
+        actual_count=Count('reviews')
+    ).filter(actual_count__gt=0)
+    for title in titles:
+        title.rating_sum = title.actual_sum
+        title.review_count = title.actual_count
+        title.rating = title.actual_sum // title.actual_count
+        title.save(update_fields=('rating_sum', 'review_count', 'rating'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_alter_title_year'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.SmallIntegerField(default=None, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from reviews.search import drop_title_search, install_title_search
+
+
+def install(apps, schema_editor):
+    install_title_search(schema_editor.connection, rebuild=True)
+
+
+def drop(apps, schema_editor):
+    drop_title_search(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_review_comment_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, drop),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+
+def fill_name_folded(apps, schema_editor):
+    for model_name in ('Category', 'Genre', 'Title'):
+        model = apps.get_model('reviews', model_name)
+        objects = list(model.objects.only('name'))
+        for obj in objects:
+            obj.name_folded = obj.name.casefold()
+        model.objects.bulk_update(objects, ('name_folded',), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_title_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='name_folded',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=256),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='genre',
+            name='name_folded',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=256),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='name_folded',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=256),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_name_folded, migrations.RunPython.noop),
+    ]
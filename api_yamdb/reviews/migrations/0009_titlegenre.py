@@ -0,0 +1,37 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_casefolded_names'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='TitleGenre',
+                    fields=[
+                        ('id', models.AutoField(primary_key=True, serialize=False)),
+                        ('genre', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='reviews.genre')),
+                        ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='reviews.title')),
+                    ],
+                    options={
+                        'db_table': 'reviews_title_genre',
+                        'unique_together': {('title', 'genre')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='title',
+                    name='genre',
+                    field=models.ManyToManyField(through='reviews.TitleGenre', to='reviews.Genre'),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='titlegenre',
+            index=models.Index(fields=['genre', 'title'], name='title_genre_genre_title_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.2 on 2026-10-18 17:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_titlegenre'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoadedCSVFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=256, unique=True)),
+                ('sha256', models.CharField(max_length=64)),
+                ('batch_size', models.PositiveIntegerField()),
+                ('batch_hashes', models.JSONField(default=list)),
+                ('loaded_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
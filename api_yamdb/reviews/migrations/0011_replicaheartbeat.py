@@ -0,0 +1,20 @@
+# Generated by Django 3.2 on 2026-10-18 17:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_loadedcsvfile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReplicaHeartbeat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('beat_at', models.DateTimeField()),
+            ],
+        ),
+    ]
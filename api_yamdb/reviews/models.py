@@ -1,25 +1,38 @@
-from django.db import models
-from django.db.models import (Model, CharField,
+from functools import partial
+
+from django.db import models, transaction
+from django.db.models import (Model, CharField, F,
                               ManyToManyField, SET_NULL,
                               SlugField, ForeignKey, TextField)
+from django.db.models.functions import NullIf
+from django.utils import timezone
 
 from django.core.validators import MaxValueValidator, MinValueValidator
 
+from api_yamdb.cache_versions import TITLE_FACETS, bump_version
 from api_yamdb.settings import (
     MAX_CHARFIELD_LENGTH,
     MAX_RATING_SCORE_VALUE,
     MAX_STRING_REPRESENTATION_LENGTH,
     MIN_RATING_SCORE_VALUE
 )
+from api_yamdb.shadow_fields import CaseFoldedShadowMixin
 from users.models import MyUser
 from .validators import custom_year_validator
 
 
-class Category(Model):
+class Category(CaseFoldedShadowMixin, Model):
     """Category model"""
     name = CharField(max_length=MAX_CHARFIELD_LENGTH)
+    name_folded = CharField(
+        max_length=MAX_CHARFIELD_LENGTH,
+        db_index=True,
+        editable=False
+    )
     slug = SlugField(unique=True)
 
+    casefolded_fields = ('name',)
+
     class Meta:
         ordering = ['slug']
 
@@ -27,11 +40,18 @@ class Category(Model):
         return self.slug
 
 
-class Genre(Model):
+class Genre(CaseFoldedShadowMixin, Model):
     """Genre model"""
     name = CharField(max_length=MAX_CHARFIELD_LENGTH)
+    name_folded = CharField(
+        max_length=MAX_CHARFIELD_LENGTH,
+        db_index=True,
+        editable=False
+    )
     slug = SlugField(unique=True)
 
+    casefolded_fields = ('name',)
+
     class Meta:
         ordering = ['slug']
 
@@ -39,13 +59,129 @@ class Genre(Model):
         return self.slug
 
 
-class Title(Model):
+class Title(CaseFoldedShadowMixin, Model):
     """Title model"""
     name = CharField(max_length=MAX_CHARFIELD_LENGTH)
+    name_folded = CharField(
+        max_length=MAX_CHARFIELD_LENGTH,
+        db_index=True,
+        editable=False
+    )
     year = models.SmallIntegerField(validators=[custom_year_validator])
     description = TextField(blank=True)
-    genre = ManyToManyField(Genre)
+    genre = ManyToManyField(Genre, through='TitleGenre')
     category = ForeignKey(Category, on_delete=SET_NULL, null=True)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    rating = models.SmallIntegerField(
+        null=True,
+        default=None,
+        editable=False
+    )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    RATING_FIELDS = ('rating_sum', 'review_count', 'rating')
+    casefolded_fields = ('name',)
+
+    def save(self, *args, **kwargs):
+        """
+        Save the title without overwriting the rating aggregates,
+        which are maintained by review writes.
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.RATING_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    def set_genres(self, genres):
+        """Replace the genres of the title with two bulk statements."""
+        TitleGenre.objects.filter(title=self).exclude(
+            genre__in=genres
+        ).delete_links()
+        self.add_genres(genres)
+        self.cache_genres(genres)
+
+    def add_genres(self, genres):
+        """Link the title to genres in one INSERT, skipping existing links."""
+        TitleGenre.objects.bulk_create(
+            [TitleGenre(title=self, genre=genre) for genre in genres],
+            ignore_conflicts=True
+        )
+        getattr(self, '_prefetched_objects_cache', {}).pop('genre', None)
+        transaction.on_commit(partial(bump_version, TITLE_FACETS))
+
+    def cache_genres(self, genres):
+        """
+        Remember `genres` as the complete genre set of the title, the
+        way `prefetch_related` does, so reading it back needs no query.
+        """
+        queryset = self.genre.all()
+        queryset._result_cache = sorted(
+            set(genres), key=lambda genre: genre.slug
+        )
+        queryset._prefetch_done = True
+        self._prefetched_objects_cache = {
+            **getattr(self, '_prefetched_objects_cache', {}),
+            'genre': queryset,
+        }
+
+    @staticmethod
+    def calculate_rating(rating_sum, review_count):
+        """Rating as the integer part of the mean review score."""
+        if not review_count:
+            return None
+        return rating_sum // review_count
+
+    @classmethod
+    def apply_score_delta(cls, title_id, score_delta, count_delta):
+        """
+        Shift the stored rating aggregates of a title in a single UPDATE,
+        so concurrent review writes never lose each other's changes.
+        """
+        new_sum = F('rating_sum') + score_delta
+        new_count = F('review_count') + count_delta
+        cls.objects.filter(pk=title_id).update(
+            rating_sum=new_sum,
+            review_count=new_count,
+            rating=models.ExpressionWrapper(
+                new_sum / NullIf(new_count, 0),
+                output_field=models.SmallIntegerField()
+            ),
+            updated_at=timezone.now()
+        )
+
+
+class TitleGenreQuerySet(models.QuerySet):
+
+    def delete_links(self):
+        """
+        Delete the links in one statement without the per-link signals;
+        callers writing links in bulk update the titles and the facets
+        themselves.
+        """
+        return self._raw_delete(self.db)
+
+
+class TitleGenre(Model):
+    """Title and genre link, the through table of `Title.genre`."""
+    id = models.AutoField(primary_key=True)
+    title = ForeignKey(Title, on_delete=models.CASCADE)
+    genre = ForeignKey(Genre, on_delete=models.CASCADE)
+
+    objects = TitleGenreQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'reviews_title_genre'
+        unique_together = (('title', 'genre'),)
+        indexes = [
+            models.Index(
+                fields=['genre', 'title'],
+                name='title_genre_genre_title_idx'
+            ),
+        ]
 
 
 class Review(models.Model):
@@ -56,9 +192,12 @@ class Review(models.Model):
         related_name='reviews'
     )
     text = models.TextField('Текст отзыва')
+    # Users may live in another database: a plain id column, never
+    # joined, with deletes cascaded by `reviews.signals`.
     author = models.ForeignKey(
         MyUser,
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
         related_name='reviews'
     )
     score = models.IntegerField(
@@ -85,6 +224,7 @@ class Review(models.Model):
         auto_now_add=True,
         db_index=True
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         constraints = [
@@ -93,10 +233,54 @@ class Review(models.Model):
                 name='title_author_unique'
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx'
+            ),
+            models.Index(
+                fields=['title', 'updated_at'],
+                name='review_title_updated_at_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text[:MAX_STRING_REPRESENTATION_LENGTH]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored score to compute rating deltas on save."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_rating = (
+            instance.__dict__.get('title_id'),
+            instance.__dict__.get('score')
+        )
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Save the review and update the title rating atomically."""
+        with transaction.atomic():
+            adding = self._state.adding
+            if not adding:
+                old_title_id, old_score = getattr(
+                    self, '_loaded_rating', (None, None)
+                )
+                if old_title_id is None or old_score is None:
+                    old_title_id, old_score = Review.objects.values_list(
+                        'title_id', 'score'
+                    ).get(pk=self.pk)
+            super().save(*args, **kwargs)
+            if adding:
+                Title.apply_score_delta(self.title_id, self.score, 1)
+            elif old_title_id != self.title_id:
+                Title.apply_score_delta(old_title_id, -old_score, -1)
+                Title.apply_score_delta(self.title_id, self.score, 1)
+            elif old_score != self.score:
+                Title.apply_score_delta(
+                    self.title_id, self.score - old_score, 0
+                )
+            self._loaded_rating = (self.title_id, self.score)
+
 
 class Comment(models.Model):
     """Comment Model."""
@@ -106,9 +290,11 @@ class Comment(models.Model):
         related_name='comments'
     )
     text = models.TextField()
+    # See `Review.author`.
     author = models.ForeignKey(
         MyUser,
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
         related_name='comments'
     )
     pub_date = models.DateTimeField(
@@ -116,6 +302,42 @@ class Comment(models.Model):
         auto_now_add=True,
         db_index=True
     )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pub_date_idx'
+            ),
+            models.Index(
+                fields=['review', 'updated_at'],
+                name='comment_review_updated_at_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text[:MAX_STRING_REPRESENTATION_LENGTH]
+
+
+class LoadedCSVFile(models.Model):
+    """Content hashes of a CSV file loaded by `load_csv`."""
+    path = CharField(max_length=MAX_CHARFIELD_LENGTH, unique=True)
+    sha256 = CharField(max_length=64)
+    batch_size = models.PositiveIntegerField()
+    batch_hashes = models.JSONField(default=list)
+    loaded_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.path
+
+
+class ReplicaHeartbeat(models.Model):
+    """
+    Time of the last replica sync, written to the primary right before
+    the copy, so every replica carries the age of its own data.
+    """
+    beat_at = models.DateTimeField()
+
+    def __str__(self):
+        return str(self.beat_at)
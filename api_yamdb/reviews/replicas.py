@@ -0,0 +1,47 @@
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+from .models import ReplicaHeartbeat
+
+HEARTBEAT_PK = 1
+
+
+def record_heartbeat():
+    ReplicaHeartbeat.objects.using(DEFAULT_DB_ALIAS).update_or_create(
+        pk=HEARTBEAT_PK, defaults={'beat_at': timezone.now()}
+    )
+
+
+def copy_database(source, target):
+    """
+    Copy a whole SQLite database between raw connections with the online
+    backup API, in one step, so writers on the source are not blocked.
+    """
+    source.backup(target)
+
+
+def sync_replica(alias):
+    """Refresh a SQLite replica with a copy of the primary database."""
+    primary = connections[DEFAULT_DB_ALIAS]
+    replica = connections[alias]
+    if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+        raise ValueError(f'"{alias}": only SQLite replicas can be synced.')
+    if replica.settings_dict['NAME'] == primary.settings_dict['NAME']:
+        raise ValueError(f'"{alias}" is the primary database file.')
+    record_heartbeat()
+    primary.ensure_connection()
+    replica.ensure_connection()
+    copy_database(primary.connection, replica.connection)
+
+
+def replica_lag(alias):
+    """
+    Upper bound of how many seconds the data of a replica is behind the
+    primary, or None if it was never synced.
+    """
+    beat_at = ReplicaHeartbeat.objects.using(alias).filter(
+        pk=HEARTBEAT_PK
+    ).values_list('beat_at', flat=True).first()
+    if beat_at is None:
+        return None
+    return max((timezone.now() - beat_at).total_seconds(), 0.0)
@@ -0,0 +1,136 @@
+import re
+
+from django.db import connection as default_connection
+from django.db import connections
+from django.db.models import BooleanField, F, Func, Q
+
+TITLE_SEARCH_TABLE = 'reviews_title_fts'
+
+SEARCH_TOKEN_RE = re.compile(r'\w+')
+
+TITLE_SEARCH_SCHEMA = (
+    f'CREATE VIRTUAL TABLE IF NOT EXISTS {TITLE_SEARCH_TABLE} USING fts5('
+    "name, description, content='reviews_title', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    'CREATE TRIGGER IF NOT EXISTS reviews_title_fts_insert '
+    'AFTER INSERT ON reviews_title BEGIN '
+    f'INSERT INTO {TITLE_SEARCH_TABLE}(rowid, name, description) '
+    'VALUES (new.id, new.name, new.description); END',
+    'CREATE TRIGGER IF NOT EXISTS reviews_title_fts_delete '
+    'AFTER DELETE ON reviews_title BEGIN '
+    f'INSERT INTO {TITLE_SEARCH_TABLE}'
+    f'({TITLE_SEARCH_TABLE}, rowid, name, description) '
+    "VALUES ('delete', old.id, old.name, old.description); END",
+    'CREATE TRIGGER IF NOT EXISTS reviews_title_fts_update '
+    'AFTER UPDATE OF name, description ON reviews_title BEGIN '
+    f'INSERT INTO {TITLE_SEARCH_TABLE}'
+    f'({TITLE_SEARCH_TABLE}, rowid, name, description) '
+    "VALUES ('delete', old.id, old.name, old.description); "
+    f'INSERT INTO {TITLE_SEARCH_TABLE}(rowid, name, description) '
+    'VALUES (new.id, new.name, new.description); END',
+)
+
+TITLE_SEARCH_DROP = (
+    'DROP TRIGGER IF EXISTS reviews_title_fts_insert',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_delete',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_update',
+    f'DROP TABLE IF EXISTS {TITLE_SEARCH_TABLE}',
+)
+
+
+def supports_title_search(connection=default_connection):
+    """Full-text search is backed by SQLite FTS5 only."""
+    return connection.vendor == 'sqlite'
+
+
+def title_search_installed(connection=default_connection):
+    """Whether the FTS5 table exists in the database."""
+    return TITLE_SEARCH_TABLE in connection.introspection.table_names()
+
+
+def install_title_search(connection=default_connection, rebuild=False):
+    """
+    Create the FTS5 index over title names and descriptions together with
+    the triggers keeping it in sync. Safe to run repeatedly: SQLite drops
+    triggers whenever a migration remakes `reviews_title`.
+    """
+    if not supports_title_search(connection):
+        return
+    created = not title_search_installed(connection)
+    with connection.cursor() as cursor:
+        for statement in TITLE_SEARCH_SCHEMA:
+            cursor.execute(statement)
+        if created or rebuild:
+            rebuild_title_search(connection)
+
+
+def drop_title_search(connection=default_connection):
+    if not supports_title_search(connection):
+        return
+    with connection.cursor() as cursor:
+        for statement in TITLE_SEARCH_DROP:
+            cursor.execute(statement)
+
+
+def rebuild_title_search(connection=default_connection):
+    """Rebuild the whole index from `reviews_title` in bulk."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {TITLE_SEARCH_TABLE}({TITLE_SEARCH_TABLE}) '
+            "VALUES ('rebuild')"
+        )
+        cursor.execute(
+            f'INSERT INTO {TITLE_SEARCH_TABLE}({TITLE_SEARCH_TABLE}) '
+            "VALUES ('optimize')"
+        )
+
+
+def build_match_expression(query):
+    """
+    Turn free user input into an FTS5 expression matching every word
+    as a prefix, with FTS5 syntax characters neutralized by quoting.
+    """
+    return ' '.join(
+        f'"{token}"*' for token in SEARCH_TOKEN_RE.findall(query)
+    )
+
+
+class TitleSearchMatch(Func):
+    """
+    Condition joining the FTS5 table on the title id and matching it.
+    The id is a column reference, so it keeps its table alias when the
+    queryset is nested as a subquery.
+    """
+
+    template = (
+        f'({TITLE_SEARCH_TABLE} MATCH %%s '
+        f'AND {TITLE_SEARCH_TABLE}.rowid = %(expressions)s)'
+    )
+    output_field = BooleanField()
+
+    def __init__(self, match):
+        super().__init__(F('pk'))
+        self.match = match
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sql, params = super().as_sql(compiler, connection, **extra_context)
+        return sql, [self.match, *params]
+
+
+def search_titles(queryset, query):
+    """
+    Filter titles by the words of `query` in their name or description,
+    best bm25 matches first. The index is joined on the title id, so it
+    is scanned once per query, ranks included.
+    """
+    if not supports_title_search(connections[queryset.db]):
+        return queryset.filter(
+            Q(name__icontains=query) | Q(description__icontains=query)
+        )
+    match = build_match_expression(query)
+    if not match:
+        return queryset.none()
+    return queryset.extra(
+        select={'search_rank': f'bm25({TITLE_SEARCH_TABLE})'},
+        tables=[TITLE_SEARCH_TABLE],
+    ).filter(TitleSearchMatch(match)).order_by('search_rank', 'pk')
@@ -0,0 +1,163 @@
+from contextvars import ContextVar
+from functools import partial
+
+from django.db import router, transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from api_yamdb.cache_versions import (
+    TITLE_FACETS,
+    bump_version,
+    mark_changed,
+    model_deletions_name,
+    model_version_name,
+)
+from users.models import MyUser
+from .models import Category, Comment, Genre, Review, Title, TitleGenre
+from .slugs import CATEGORY_SLUGS, GENRE_SLUGS
+
+# `(model, pk)` of the genres and titles being deleted.
+deleting_links_of = ContextVar('deleting_links_of', default=frozenset())
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_score_from_rating(sender, instance, **kwargs):
+    """
+    Subtract a deleted review from the title rating. Fires for direct
+    deletes as well as cascades from user or title deletion, inside the
+    deletion transaction.
+    """
+    Title.apply_score_delta(instance.title_id, -instance.score, -1)
+
+
+@receiver(post_delete, sender=MyUser)
+def delete_user_publications(sender, instance, **kwargs):
+    """
+    Cascade a user deletion to their reviews and comments, which may be
+    stored in another database and only reference the user by id. An
+    error here also rolls the user deletion back.
+    """
+    using = router.db_for_write(Review)
+    with transaction.atomic(using=using):
+        Comment.objects.using(using).filter(author_id=instance.pk).delete()
+        Review.objects.using(using).filter(author_id=instance.pk).delete()
+
+
+@receiver(post_save, sender=MyUser)
+def touch_renamed_author_publications(sender, instance, created, **kwargs):
+    """
+    Reviews and comments render the username of their author, a rename
+    moves their `updated_at` forward.
+    """
+    loaded = getattr(instance, '_loaded_username', None)
+    instance._loaded_username = instance.username
+    if created or loaded is None or loaded == instance.username:
+        return
+    using = router.db_for_write(Review)
+    now = timezone.now()
+    with transaction.atomic(using=using):
+        Review.objects.using(using).filter(
+            author_id=instance.pk
+        ).update(updated_at=now)
+        Comment.objects.using(using).filter(
+            author_id=instance.pk
+        ).update(updated_at=now)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def touch_genre_titles(sender, instance, created=False, **kwargs):
+    """Titles render their genres: move their `updated_at` forward."""
+    if not created:
+        Title.objects.filter(genre=instance).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def touch_category_titles(sender, instance, created=False, **kwargs):
+    """Titles render their category: move their `updated_at` forward."""
+    if not created:
+        Title.objects.filter(
+            category=instance
+        ).update(updated_at=timezone.now())
+
+
+@receiver(pre_delete, sender=Genre)
+@receiver(pre_delete, sender=Title)
+def start_links_cascade(sender, instance, **kwargs):
+    """
+    Remember whose deletion cascades to genre links: the receivers of the
+    genre or title already update the titles and the facets.
+    """
+    deleting_links_of.set(deleting_links_of.get() | {(sender, instance.pk)})
+
+
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Title)
+def end_links_cascade(sender, instance, **kwargs):
+    deleting_links_of.set(deleting_links_of.get() - {(sender, instance.pk)})
+
+
+@receiver(post_save, sender=TitleGenre)
+@receiver(post_delete, sender=TitleGenre)
+def touch_linked_title(sender, instance, **kwargs):
+    """
+    A genre link saved one by one, from the admin inline for instance,
+    changes the genres the title renders and is counted by. Links
+    written in bulk are handled by `Title.add_genres`.
+    """
+    cascade = deleting_links_of.get()
+    if (Genre, instance.genre_id) in cascade or (
+            (Title, instance.title_id) in cascade):
+        return
+    Title.objects.filter(pk=instance.title_id).update(
+        updated_at=timezone.now()
+    )
+    transaction.on_commit(partial(bump_version, TITLE_FACETS))
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Comment)
+def mark_deletion(sender, **kwargs):
+    """
+    Deleted rows leave no `updated_at` behind to date the change of the
+    lists they were in.
+    """
+    transaction.on_commit(partial(mark_changed, model_deletions_name(sender)))
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_title_facets(sender, **kwargs):
+    """
+    Titles or the slugs they are counted by changed. Genre links are
+    written in bulk and invalidate the facets in `Title.add_genres`.
+    """
+    transaction.on_commit(partial(bump_version, TITLE_FACETS))
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_model_caches(sender, **kwargs):
+    """Move the version of the cached responses listing the model."""
+    transaction.on_commit(partial(bump_version, model_version_name(sender)))
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def invalidate_genre_slugs(sender, **kwargs):
+    transaction.on_commit(partial(bump_version, GENRE_SLUGS))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_slugs(sender, **kwargs):
+    transaction.on_commit(partial(bump_version, CATEGORY_SLUGS))
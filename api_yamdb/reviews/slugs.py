@@ -0,0 +1,59 @@
+from django.db import connection
+
+from api_yamdb.cache_versions import bump_version, get_version
+from .models import Category, Genre
+
+GENRE_SLUGS = 'genre_slugs'
+CATEGORY_SLUGS = 'category_slugs'
+
+
+class SlugCache:
+    """
+    Process-local map of slugs to model rows, resolving any number of
+    slugs with at most one `IN` query for those not cached yet. The map
+    is dropped whenever the version `version_name` moves, which signals
+    do on every write to the model.
+    """
+
+    def __init__(self, model, version_name):
+        self.model = model
+        self.version_name = version_name
+        self.version = None
+        self.rows = {}
+
+    def resolve(self, slugs):
+        """Map every known slug of `slugs` to a fresh model instance."""
+        version = get_version(self.version_name)
+        if version != self.version:
+            self.rows = {}
+            self.version = version
+        rows = self.rows
+        missing = set(slugs) - rows.keys()
+        if missing:
+            queryset = self.model.objects.filter(slug__in=missing)
+            fetched = {
+                row['slug']: (queryset.db, row) for row in queryset.values()
+            }
+            # Rows read inside a transaction may still be rolled back.
+            if not connection.in_atomic_block:
+                rows.update(fetched)
+            rows = {**rows, **fetched}
+        return {
+            slug: self.instance(*rows[slug]) for slug in slugs if slug in rows
+        }
+
+    def invalidate(self):
+        """Drop the map in every process, after a slug turned out stale."""
+        self.version = None
+        bump_version(self.version_name)
+
+    def instance(self, db, row):
+        """An instance of a row read from the database `db`."""
+        instance = self.model(**row)
+        instance._state.adding = False
+        instance._state.db = db
+        return instance
+
+
+genre_slugs = SlugCache(Genre, GENRE_SLUGS)
+category_slugs = SlugCache(Category, CATEGORY_SLUGS)
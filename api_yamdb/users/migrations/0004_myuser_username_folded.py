@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+def fill_username_folded(apps, schema_editor):
+    MyUser = apps.get_model('users', 'MyUser')
+    users = list(MyUser.objects.only('username'))
+    for user in users:
+        user.username_folded = user.username.casefold()
+    MyUser.objects.bulk_update(users, ('username_folded',), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_alter_myuser_username'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='myuser',
+            name='username_folded',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=150),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_username_folded, migrations.RunPython.noop),
+    ]
@@ -3,10 +3,11 @@ from django.db import models
 from django.contrib.auth.validators import UnicodeUsernameValidator
 
 from api_yamdb.settings import MAX_USERNAME_LENGTH
+from api_yamdb.shadow_fields import CaseFoldedShadowMixin
 from .validators import not_equal_me_username_validator
 
 
-class MyUser(AbstractUser):
+class MyUser(CaseFoldedShadowMixin, AbstractUser):
     """Custom User model class."""
 
     ROLE_CHOICES = [
@@ -24,6 +25,11 @@ class MyUser(AbstractUser):
             not_equal_me_username_validator
         ]
     )
+    username_folded = models.CharField(
+        max_length=MAX_USERNAME_LENGTH,
+        db_index=True,
+        editable=False
+    )
     email = models.EmailField(
         verbose_name='Адрес электронной почты',
         unique=True
@@ -40,9 +46,18 @@ class MyUser(AbstractUser):
         blank=True,
     )
 
+    casefolded_fields = ('username',)
+
     class Meta:
         verbose_name = 'Пользователь'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored username to detect renames on save."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_username = instance.__dict__.get('username')
+        return instance
+
     @property
     def is_moderator(self):
         return self.role == 'moderator'
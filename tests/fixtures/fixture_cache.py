@@ -0,0 +1,26 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(scope='session', autouse=True)
+def cache_location(tmp_path_factory):
+    """
+    Keep the file cache of the tests apart from the one of the project,
+    which `clear_cache` would wipe.
+    """
+    from django.conf import settings
+    from django.test.signals import setting_changed
+
+    settings.CACHES['default']['LOCATION'] = str(
+        tmp_path_factory.mktemp('cache')
+    )
+    setting_changed.send(
+        sender=None, setting='CACHES', value=settings.CACHES, enter=True
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
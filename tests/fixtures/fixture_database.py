@@ -0,0 +1,94 @@
+from contextlib import ExitStack, contextmanager
+
+import pytest
+from django.db import connections
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--single-database',
+        action='store_true',
+        help='Keep every app in the default database instead of storing '
+             'users in a database of their own.'
+    )
+
+
+def pytest_collection_modifyitems(items):
+    """Let database tests query every database, users are stored apart."""
+    for item in items:
+        marker = item.get_closest_marker('django_db')
+        if marker is not None and 'databases' not in marker.kwargs:
+            item.add_marker(pytest.mark.django_db(
+                *marker.args, databases='__all__', **marker.kwargs
+            ), append=False)
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(django_db_modify_db_settings_parallel_suffix,
+                                 tmp_path_factory, pytestconfig):
+    """
+    Test against database files instead of SQLite's shared-cache memory
+    databases, whose table locks ignore the busy timeout, so concurrent
+    tests see the WAL locking of production. Users get a database of
+    their own unless `--single-database` is given.
+    """
+    from django.conf import settings
+
+    if not pytestconfig.getoption('single_database'):
+        settings.DATABASE_APPS_MAPPING = settings.USERS_DATABASE_APPS_MAPPING
+    directory = tmp_path_factory.mktemp('database')
+    for alias, database in settings.DATABASES.items():
+        test_settings = database.setdefault('TEST', {})
+        if not test_settings.get('NAME') and not test_settings.get('MIRROR'):
+            test_settings['NAME'] = str(directory / f'test_{alias}.sqlite3')
+
+
+class QueryCapture:
+    """`execute_wrapper` recording the SQL of every query, in order."""
+
+    def __init__(self):
+        self.captured_queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.captured_queries.append({'sql': sql})
+        return execute(sql, params, many, context)
+
+    def __len__(self):
+        return len(self.captured_queries)
+
+
+@pytest.fixture
+def django_assert_num_queries():
+    """
+    pytest-django's fixture counting the queries sent to all databases,
+    so counts do not depend on how the apps are split between them.
+    """
+    @contextmanager
+    def assert_num_queries(num):
+        capture = QueryCapture()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(capture))
+            yield capture
+        if len(capture) != num:
+            pytest.fail(
+                f'Expected to perform {num} queries but {len(capture)} '
+                'were done:\n' + '\n'.join(
+                    query['sql'] for query in capture.captured_queries
+                )
+            )
+
+    return assert_num_queries
+
+
+@pytest.fixture
+def author_queries():
+    """
+    Queries reading the authors of reviews or comments: none when users
+    share the database and are joined, one when they are stored apart.
+    """
+    from api_yamdb.db_router import same_database
+    from reviews.models import Review
+    from users.models import MyUser
+
+    return 0 if same_database(Review, MyUser) else 1
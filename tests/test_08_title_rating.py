@@ -0,0 +1,107 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_writes(self, admin_client, admin,
+                                             user_client, user):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        title_id = titles[0]['id']
+        assert self.get_rating(admin_client, title_id) == 5, (
+            'Проверьте, что после создания отзыва поле `rating` '
+            'произведения пересчитывается.'
+        )
+
+        create_single_review(user_client, title_id, 'text', 8)
+        assert self.get_rating(admin_client, title_id) == 6, (
+            'Проверьте, что `rating` равен целой части среднего значения '
+            'оценок всех отзывов произведения.'
+        )
+
+        admin_client.patch(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id),
+            data={'name': 'Новое название'}
+        )
+        assert self.get_rating(admin_client, title_id) == 6, (
+            'Проверьте, что изменение произведения не сбрасывает его '
+            '`rating`.'
+        )
+
+        admin_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            ),
+            data={'score': 10}
+        )
+        assert self.get_rating(admin_client, title_id) == 9, (
+            'Проверьте, что после изменения оценки отзыва поле `rating` '
+            'произведения пересчитывается.'
+        )
+
+        admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            )
+        )
+        assert self.get_rating(admin_client, title_id) == 8, (
+            'Проверьте, что после удаления отзыва поле `rating` '
+            'произведения пересчитывается.'
+        )
+
+        user.delete()
+        assert self.get_rating(admin_client, title_id) is None, (
+            'Проверьте, что при каскадном удалении отзывов вместе с '
+            'автором поле `rating` произведения пересчитывается.'
+        )
+
+    def test_02_recompute_ratings_repairs_drift(self, admin_client, admin):
+        from django.db import connection
+
+        from reviews.models import Title
+
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        title_id = titles[0]['id']
+        Title.objects.filter(pk=title_id).update(
+            rating_sum=100, review_count=3, rating=33
+        )
+
+        with pytest.raises(CommandError):
+            call_command('recompute_ratings', '--check', stdout=StringIO())
+
+        queries = []
+
+        def record(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            call_command('recompute_ratings', stdout=StringIO())
+        assert queries[0] == 'BEGIN IMMEDIATE', (
+            'Проверьте, что `recompute_ratings` читает отзывы в той же '
+            'транзакции, что и исправляет рейтинги.'
+        )
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.review_count, title.rating) == (
+            5, 1, 5
+        ), (
+            'Проверьте, что команда `recompute_ratings` восстанавливает '
+            'значения рейтинга произведения по его отзывам.'
+        )
+        call_command('recompute_ratings', '--check', stdout=StringIO())
@@ -0,0 +1,171 @@
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def create_many_titles(self, count):
+        from reviews.models import Category, Genre, Title
+
+        category = Category.objects.create(name='Фильм', slug='films')
+        genres = [
+            Genre.objects.create(name='Драма', slug='drama'),
+            Genre.objects.create(name='Комедия', slug='comedy'),
+        ]
+        for idx in range(count):
+            title = Title.objects.create(
+                name=f'Произведение {idx}', year=2000, category=category
+            )
+            title.genre.set(genres)
+
+    @pytest.mark.parametrize('titles_count', (2, 10))
+    def test_01_title_list_queries(self, client, django_assert_num_queries,
+                                   titles_count):
+        self.create_many_titles(titles_count)
+        with django_assert_num_queries(4):
+            response = client.get(self.TITLES_URL)
+        assert len(response.json()['results']) == titles_count, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` возвращает '
+            'все произведения.'
+        )
+
+    def test_02_title_detail_queries(self, client, django_assert_num_queries):
+        self.create_many_titles(1)
+        from reviews.models import Title
+
+        title_id = Title.objects.get().id
+        with django_assert_num_queries(3):
+            response = client.get(
+                self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+            )
+        assert len(response.json()['genre']) == 2, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_DETAIL_URL_TEMPLATE}` '
+            'возвращает жанры произведения.'
+        )
+
+    def test_03_title_write_queries(self, admin_client,
+                                    django_assert_num_queries):
+        titles, categories, genres = create_titles(admin_client)
+        data = {
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug'], genres[2]['slug']],
+            'category': categories[0]['slug'],
+        }
+        with django_assert_num_queries(4):
+            response = admin_client.post(self.TITLES_URL, data=data)
+        response_genres = {
+            genre['slug'] for genre in response.json()['genre']
+        }
+        assert response_genres == set(data['genre']), (
+            f'Проверьте, что ответ на POST-запрос к `{self.TITLES_URL}` '
+            'содержит жанры произведения.'
+        )
+        with django_assert_num_queries(7):
+            admin_client.patch(
+                self.TITLES_DETAIL_URL_TEMPLATE.format(
+                    title_id=titles[0]['id']
+                ),
+                data=data
+            )
+
+    def test_04_slug_cache(self, admin_client, django_assert_num_queries):
+        from django.core.cache import cache
+
+        _, categories, genres = create_titles(admin_client)
+        data = {
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug'], genres[2]['slug']],
+            'category': categories[0]['slug'],
+        }
+        cache.clear()
+        # Genre and category slugs are looked up once, then cached.
+        with django_assert_num_queries(6):
+            admin_client.post(self.TITLES_URL, data=data)
+        with django_assert_num_queries(4):
+            admin_client.post(self.TITLES_URL, data=data)
+
+        admin_client.delete(f'/api/v1/genres/{genres[0]["slug"]}/')
+        response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == 400, (
+            'Проверьте, что кэш слагов сбрасывается при удалении жанра.'
+        )
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Новый', 'slug': 'new'}
+        )
+        response = admin_client.post(
+            self.TITLES_URL, data={**data, 'genre': ['new']}
+        )
+        assert response.status_code == 201, (
+            'Проверьте, что новый жанр сразу доступен для произведений.'
+        )
+
+    def test_05_slug_deleted_by_another_worker(self, admin_client):
+        from django.db import connection
+
+        create_titles(admin_client)
+        admin_client.post('/api/v1/genres/', data={'name': 'Нуар', 'slug': 'noir'})
+        data = {'name': 'Чужой', 'year': 1979, 'genre': ['noir'],
+                'category': 'films'}
+        # Resolves and caches the slugs, the year is invalid.
+        response = admin_client.post(
+            self.TITLES_URL, data={**data, 'year': 3000}
+        )
+        assert response.status_code == 400
+        # Deleted elsewhere: the signals of this process do not run.
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM reviews_genre WHERE slug = 'noir'")
+        response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == 400, (
+            'Проверьте, что произведение с удалённым жанром из устаревшего '
+            'кэша слагов не создаётся и возвращается ответ со статусом 400.'
+        )
+        assert list(response.json()) == ['genre']
+
+        items = [
+            {**data, 'genre': ['drama'], 'category': 'series'},
+            {**data, 'genre': ['drama']},
+        ]
+
+        def delete_cached_category():
+            admin_client.post(
+                '/api/v1/categories/', data={'name': 'Сериал', 'slug': 'series'}
+            )
+            # Resolves and caches the slugs, the name is invalid.
+            admin_client.post(
+                f'{self.TITLES_URL}bulk/',
+                data=[{**items[0], 'name': ''}], format='json'
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "DELETE FROM reviews_category WHERE slug = 'series'"
+                )
+
+        delete_cached_category()
+        response = admin_client.post(
+            f'{self.TITLES_URL}bulk/', data=items, format='json'
+        )
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert [result['status'] for result in results] == [
+            'invalid', 'created'
+        ], (
+            'Проверьте, что при массовой записи отклоняются только '
+            'произведения с удалёнными слагами.'
+        )
+        assert list(results[0]['errors']) == ['category']
+
+        delete_cached_category()
+        response = admin_client.post(
+            f'{self.TITLES_URL}bulk/?atomic=true', data=items, format='json'
+        )
+        assert response.status_code == 400
+        assert [
+            result['status'] for result in response.json()['results']
+        ] == ['invalid', 'skipped']
@@ -0,0 +1,81 @@
+from base64 import urlsafe_b64encode
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments, create_single_comment
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10KeysetPagination:
+
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_comments_cursor_pages(self, admin_client, admin, user_client,
+                                      user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        for idx in range(3):
+            comments.append({'id': create_single_comment(
+                user_client, titles[0]['id'], reviews[0]['id'], f'more {idx}'
+            ).json()['id']})
+        expected_ids = [comment['id'] for comment in reversed(comments)]
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+
+        response = admin_client.get(url, {'limit': 2})
+        assert 'count' in response.json(), (
+            f'Проверьте, что пагинация limit/offset для `{url}` '
+            'продолжает работать.'
+        )
+
+        response = admin_client.get(url, {'pagination': 'cursor', 'limit': 2})
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert 'count' not in data and data['previous'] is None, (
+            'Проверьте, что курсорная пагинация не выполняет COUNT и '
+            'не содержит ссылки на предыдущую страницу для первой страницы.'
+        )
+        pages = [data]
+        while data['next']:
+            data = admin_client.get(data['next']).json()
+            pages.append(data)
+        received_ids = [
+            comment['id'] for page in pages for comment in page['results']
+        ]
+        assert received_ids == expected_ids, (
+            'Проверьте, что курсорная пагинация возвращает все комментарии '
+            'от новых к старым без пропусков и повторов.'
+        )
+
+        previous = admin_client.get(pages[-1]['previous']).json()
+        assert previous['results'] == pages[-2]['results'], (
+            'Проверьте, что ссылка `previous` курсорной пагинации ведёт на '
+            'предыдущую страницу.'
+        )
+
+    def test_02_invalid_cursor(self, admin_client, admin):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        response = admin_client.get(url, {'cursor': 'not-a-cursor'})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что запрос с некорректным курсором возвращает ответ '
+            'со статусом 404.'
+        )
+        for payload in ('["2020-01-01T00:00:00+00:00",1e30,0]',
+                        f'["2020-01-01T00:00:00+00:00",{10 ** 30},0]',
+                        '["2020-01-01T00:00:00+00:00",true,0]'):
+            cursor = urlsafe_b64encode(payload.encode()).decode()
+            response = admin_client.get(url, {'cursor': cursor})
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                'Проверьте, что курсор с идентификатором вне диапазона '
+                'возвращает ответ со статусом 404.'
+            )
@@ -0,0 +1,126 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments, create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ReviewCommentQueries:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_review_create_queries(self, admin_client, user_client,
+                                      django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        data = {'text': 'Отличный фильм', 'score': 8}
+        with django_assert_num_queries(5):
+            response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв пользователя на то же '
+            'произведение возвращает ответ со статусом 400.'
+        )
+        assert response.json() == {
+            'non_field_errors': ['Вы уже оставляли отзыв на это произведение.']
+        }
+
+    def test_02_comment_create_queries(self, admin_client, admin,
+                                       django_assert_num_queries):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        with django_assert_num_queries(3):
+            response = admin_client.post(url, data={'text': 'Согласен'})
+        assert response.status_code == HTTPStatus.CREATED
+
+    @pytest.mark.parametrize('authors_count', (1, 3))
+    def test_03_review_list_queries(self, admin_client, admin, user_client,
+                                    user, moderator_client, moderator,
+                                    client, django_assert_num_queries,
+                                    author_queries, authors_count):
+        authors_map = dict(list({
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }.items())[:authors_count])
+        _, titles = create_reviews(admin_client, authors_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        # Parent object, validators, page count, page and the usernames of
+        # its authors, unless they are joined.
+        with django_assert_num_queries(4 + author_queries) as context:
+            response = client.get(url)
+        assert len(response.json()['results']) == authors_count
+        if not author_queries:
+            assert 'users_myuser' in context.captured_queries[-1]['sql'], (
+                'Проверьте, что авторы загружаются в том же запросе, если '
+                'пользователи хранятся в той же базе данных.'
+            )
+
+    def test_04_review_detail_queries(self, admin_client, admin, client,
+                                      django_assert_num_queries,
+                                      author_queries):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        ) + f'{reviews[0]["id"]}/'
+        with django_assert_num_queries(2 + author_queries):
+            response = client.get(url)
+        assert response.json()['author'] == admin.username
+        with django_assert_num_queries(5 + author_queries):
+            response = admin_client.patch(url, data={'score': 7})
+        assert response.json()['author'] == admin.username
+        with django_assert_num_queries(6):
+            response = admin_client.delete(url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+
+    @pytest.mark.parametrize('authors_count', (1, 3))
+    def test_05_comment_list_queries(self, admin_client, admin, user_client,
+                                     user, moderator_client, moderator,
+                                     client, django_assert_num_queries,
+                                     author_queries, authors_count):
+        authors_map = dict(list({
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }.items())[:authors_count])
+        _, reviews, titles = create_comments(admin_client, authors_map)
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        # Parent object, validators, page count, page and the usernames of
+        # its authors, unless they are joined.
+        with django_assert_num_queries(4 + author_queries) as context:
+            response = client.get(url)
+        assert len(response.json()['results']) == authors_count
+        if not author_queries:
+            assert 'users_myuser' in context.captured_queries[-1]['sql'], (
+                'Проверьте, что авторы загружаются в том же запросе, если '
+                'пользователи хранятся в той же базе данных.'
+            )
+
+    def test_06_comment_detail_queries(self, admin_client, admin, client,
+                                       django_assert_num_queries,
+                                       author_queries):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        ) + f'{comments[0]["id"]}/'
+        with django_assert_num_queries(2 + author_queries):
+            response = client.get(url)
+        assert response.json()['author'] == admin.username
+        with django_assert_num_queries(3 + author_queries):
+            response = admin_client.patch(url, data={'text': 'Уточнение'})
+        assert response.json()['author'] == admin.username
+        with django_assert_num_queries(4):
+            response = admin_client.delete(url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
@@ -0,0 +1,56 @@
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12QueryBudget:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_budget_exceeded_raises(self, admin_client, client,
+                                       monkeypatch):
+        from api.query_budget import QueryBudgetExceeded
+        from api.views import TitleViewSet
+
+        create_titles(admin_client)
+        monkeypatch.setattr(TitleViewSet, 'query_budget', {'list': 1})
+        with pytest.raises(QueryBudgetExceeded) as exc_info:
+            client.get(self.TITLES_URL)
+        assert 'TitleViewSet.list: 4 queries, budget 1' in str(
+            exc_info.value
+        ), (
+            'Проверьте, что при превышении бюджета запросов сообщение '
+            'содержит имя представления, действие и число запросов.'
+        )
+
+    def test_02_budget_log_mode(self, admin_client, client, monkeypatch,
+                                settings, caplog):
+        from api.views import TitleViewSet
+
+        create_titles(admin_client)
+        settings.QUERY_BUDGET_MODE = 'log'
+        monkeypatch.setattr(TitleViewSet, 'query_budget', {'list': 1})
+        response = client.get(self.TITLES_URL)
+        assert response.status_code == 200
+        assert 'Query budget exceeded' in caplog.text
+
+    def test_03_normalize_sql_groups_repeats(self):
+        from api.query_budget import QueryRecorder
+
+        recorder = QueryRecorder()
+        execute = (lambda sql, params, many, context: None)
+        for pk in (1, 2, 3):
+            recorder(
+                execute,
+                f'SELECT "name" FROM "genre" WHERE "id" = {pk} LIMIT 21',
+                (), False, {}
+            )
+        recorder(
+            execute, 'SELECT "id" FROM "genre" WHERE "id" IN (%s, %s)',
+            (1, 2), False, {}
+        )
+        assert recorder.report().splitlines() == [
+            '   3 x SELECT "name" FROM "genre" WHERE "id" = ? LIMIT ?',
+            '   1 x SELECT "id" FROM "genre" WHERE "id" IN (...)',
+        ]
@@ -0,0 +1,82 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'search': query})
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_by_name_and_description(self, admin_client, client):
+        create_titles(admin_client)
+        assert self.search(client, 'терминат') == ['Терминатор'], (
+            'Проверьте, что поиск по `search` находит произведение по '
+            'началу слова в названии без учёта регистра.'
+        )
+        assert self.search(client, 'yippie') == ['Крепкий орешек'], (
+            'Проверьте, что поиск по `search` находит произведение по '
+            'описанию.'
+        )
+        assert self.search(client, '"*)(') == []
+
+    def test_02_search_ranked_by_relevance(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[1]['id']),
+            data={'description': 'Не Терминатор, но тоже хорош.'}
+        )
+        assert self.search(client, 'терминатор') == [
+            'Терминатор', 'Крепкий орешек'
+        ], (
+            'Проверьте, что результаты поиска упорядочены по релевантности.'
+        )
+
+    def test_03_search_index_follows_writes(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            data={'name': 'Чужой'}
+        )
+        assert self.search(client, 'терминатор') == []
+        assert self.search(client, 'чужой') == ['Чужой']
+        admin_client.delete(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        )
+        assert self.search(client, 'чужой') == []
+
+        call_command('rebuild_title_search', stdout=StringIO())
+        assert self.search(client, 'орешек') == ['Крепкий орешек']
+
+    def test_04_search_scans_index_once(self, client):
+        from django.db import connection
+
+        from reviews.models import Title
+        from reviews.search import TITLE_SEARCH_TABLE, search_titles
+
+        Title.objects.bulk_create([
+            Title(name=f'Сага {idx}', year=2000, description='Сага о героях')
+            for idx in range(2000)
+        ])
+        sql, params = search_titles(
+            Title.objects.all(), 'сага'
+        ).query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = [row[-1] for row in cursor.fetchall()]
+        assert sum(TITLE_SEARCH_TABLE in step for step in plan) == 1, (
+            'Проверьте, что поиск просматривает полнотекстовый индекс '
+            'один раз за запрос.'
+        )
+        assert not any('SUBQUERY' in step for step in plan), plan
+        response = client.get(self.TITLES_URL, {'search': 'сага'})
+        assert response.json()['count'] == 2000
+        assert len(response.json()['results']) == 10
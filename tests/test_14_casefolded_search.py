@@ -0,0 +1,104 @@
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14CaseFoldedSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+    GENRES_URL = '/api/v1/genres/'
+    CATEGORY_URL = '/api/v1/categories/'
+
+    def test_01_cyrillic_case_insensitive(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get(self.TITLES_URL, {'name': 'КРЕПКИЙ'})
+        assert [
+            title['name'] for title in response.json()['results']
+        ] == ['Крепкий орешек'], (
+            f'Проверьте, что фильтр `name` для `{self.TITLES_URL}` не '
+            'учитывает регистр кириллических символов.'
+        )
+        response = client.get(self.GENRES_URL, {'search': 'дРа'})
+        assert [
+            genre['slug'] for genre in response.json()['results']
+        ] == ['drama'], (
+            f'Проверьте, что поиск `search` для `{self.GENRES_URL}` находит '
+            'жанры по началу названия без учёта регистра.'
+        )
+        response = client.get(self.CATEGORY_URL, {'search': 'КНИ'})
+        assert [
+            category['slug'] for category in response.json()['results']
+        ] == ['books']
+
+    def test_03_search_infix_and_prefix(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get(self.CATEGORY_URL, {'search': 'ЛЬМ'})
+        assert [
+            category['slug'] for category in response.json()['results']
+        ] == ['films'], (
+            f'Проверьте, что поиск `search` для `{self.CATEGORY_URL}` находит '
+            'категории по подстроке названия.'
+        )
+        response = client.get(
+            self.CATEGORY_URL, {'search': 'льм', 'search_match': 'prefix'}
+        )
+        assert response.json()['results'] == [], (
+            'Проверьте, что `search_match=prefix` ищет только по началу '
+            'названия.'
+        )
+        response = client.get(
+            self.CATEGORY_URL, {'search': 'фи', 'search_match': 'prefix'}
+        )
+        assert [
+            category['slug'] for category in response.json()['results']
+        ] == ['films']
+        response = client.get(self.GENRES_URL, {'search': 'ама др'})
+        assert [
+            genre['slug'] for genre in response.json()['results']
+        ] == ['drama'], (
+            'Проверьте, что каждое слово поиска ищется как подстрока.'
+        )
+
+    def test_02_shadow_column_follows_name(self, admin_client):
+        from reviews.models import Genre, Title
+
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', data={'name': 'ЧУЖОЙ'}
+        )
+        assert Title.objects.get(pk=titles[0]['id']).name_folded == 'чужой'
+        genre = Genre.objects.get(slug='drama')
+        genre.name = 'ТРИЛЛЕР'
+        genre.save(update_fields=['name'])
+        genre.refresh_from_db()
+        assert genre.name_folded == 'триллер'
+
+    def test_04_title_name_prefix(self, admin_client, client):
+        from api_yamdb.shadow_fields import prefix_range
+        from reviews.models import Title
+
+        create_titles(admin_client)
+        response = client.get(self.TITLES_URL, {'name': 'ОРЕШ'})
+        assert [
+            title['name'] for title in response.json()['results']
+        ] == ['Крепкий орешек']
+        response = client.get(
+            self.TITLES_URL, {'name': 'ореш', 'name_match': 'prefix'}
+        )
+        assert response.json()['results'] == [], (
+            'Проверьте, что `name_match=prefix` ищет только по началу '
+            'названия произведения.'
+        )
+        response = client.get(
+            self.TITLES_URL, {'name': 'КРЕПКИЙ о', 'name_match': 'prefix'}
+        )
+        assert [
+            title['name'] for title in response.json()['results']
+        ] == ['Крепкий орешек']
+        plan = Title.objects.filter(
+            **prefix_range('name_folded', 'креп')
+        ).values('pk').explain()
+        assert 'name_folded' in plan and 'SCAN' not in plan, (
+            'Проверьте, что поиск по началу названия использует индекс.'
+        )
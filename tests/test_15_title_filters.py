@@ -0,0 +1,47 @@
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitleFilters:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def filter_titles(self, client, **params):
+        data = client.get(self.TITLES_URL, params).json()
+        assert data['count'] == len(data['results'])
+        return sorted(title['name'] for title in data['results'])
+
+    def test_01_genre_filter(self, admin_client, client):
+        create_titles(admin_client)
+        assert self.filter_titles(client, genre='horror,comedy') == [
+            'Терминатор'
+        ], (
+            'Проверьте, что фильтр `genre` не возвращает произведение '
+            'несколько раз, если совпало несколько его жанров.'
+        )
+        assert self.filter_titles(client, genre='horror,drama') == [
+            'Крепкий орешек', 'Терминатор'
+        ]
+        assert self.filter_titles(
+            client, genre='horror,comedy', genre_match='all'
+        ) == ['Терминатор'], (
+            'Проверьте, что `genre_match=all` возвращает произведения со '
+            'всеми перечисленными жанрами.'
+        )
+        assert self.filter_titles(
+            client, genre='horror,drama', genre_match='all'
+        ) == []
+        assert self.filter_titles(client, genre='horr') == [], (
+            'Проверьте, что фильтр `genre` сравнивает slug точно.'
+        )
+
+    def test_02_category_filter(self, admin_client, client):
+        create_titles(admin_client)
+        assert self.filter_titles(client, category='films,books') == [
+            'Крепкий орешек', 'Терминатор'
+        ]
+        assert self.filter_titles(client, category='books') == [
+            'Крепкий орешек'
+        ]
@@ -0,0 +1,102 @@
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TitleFacets:
+
+    TITLES_URL = '/api/v1/titles/'
+    FACETS_URL = '/api/v1/titles/facets/'
+
+    def test_01_facet_counts(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get(self.FACETS_URL)
+        assert response.status_code == 200, (
+            f'Эндпоинт `{self.FACETS_URL}` не найден, проверьте настройки в '
+            '*urls.py*.'
+        )
+        assert response.json() == {
+            'genre': [
+                {'slug': 'comedy', 'count': 1},
+                {'slug': 'drama', 'count': 1},
+                {'slug': 'horror', 'count': 1},
+            ],
+            'category': [
+                {'slug': 'books', 'count': 1},
+                {'slug': 'films', 'count': 1},
+            ],
+            'year': [{'from': 1980, 'to': 1989, 'count': 2}],
+        }
+
+        response = client.get(self.FACETS_URL, {'genre': 'horror'})
+        assert response.json()['category'] == [
+            {'slug': 'films', 'count': 1}
+        ], (
+            f'Проверьте, что `{self.FACETS_URL}` учитывает фильтры '
+            'произведений.'
+        )
+
+    def test_02_facets_cached_and_invalidated(self, admin_client, client,
+                                              django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        client.get(self.FACETS_URL, {'genre': 'drama,horror'})
+        with django_assert_num_queries(0):
+            cached = client.get(self.FACETS_URL, {'genre': 'horror,drama'})
+        assert len(cached.json()['genre']) == 3
+
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[1]["id"]}/',
+            data={'genre': ['comedy']}
+        )
+        response = client.get(self.FACETS_URL, {'genre': 'horror,drama'})
+        assert response.json()['genre'] == [
+            {'slug': 'comedy', 'count': 1},
+            {'slug': 'horror', 'count': 1},
+        ], (
+            'Проверьте, что кеш фасетов сбрасывается при изменении жанров '
+            'произведения.'
+        )
+
+    def test_03_facets_with_search(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get(self.FACETS_URL, {'search': 'терминатор'})
+        assert response.status_code == 200, (
+            f'Проверьте, что `{self.FACETS_URL}` принимает параметр '
+            '`search`.'
+        )
+        assert response.json() == {
+            'genre': [
+                {'slug': 'comedy', 'count': 1},
+                {'slug': 'horror', 'count': 1},
+            ],
+            'category': [{'slug': 'films', 'count': 1}],
+            'year': [{'from': 1980, 'to': 1989, 'count': 1}],
+        }
+
+    def test_04_single_genre_links(self, admin_client, client):
+        from django.contrib import admin
+
+        from reviews.models import Genre, Title, TitleGenre
+
+        assert TitleGenre in [
+            inline.model for inline in admin.site._registry[Title].inlines
+        ], 'Проверьте, что жанры произведения редактируются в админке.'
+        titles, _, _ = create_titles(admin_client)
+        title = Title.objects.get(pk=titles[1]['id'])
+        client.get(self.FACETS_URL)
+        link = TitleGenre.objects.create(
+            title=title, genre=Genre.objects.get(slug='comedy')
+        )
+        assert {'slug': 'comedy', 'count': 2} in client.get(
+            self.FACETS_URL
+        ).json()['genre'], (
+            'Проверьте, что сохранение связи с жанром сбрасывает кэш фасетов.'
+        )
+        updated_at = Title.objects.get(pk=title.pk).updated_at
+        assert updated_at > title.updated_at
+        link.delete()
+        assert {'slug': 'comedy', 'count': 1} in client.get(
+            self.FACETS_URL
+        ).json()['genre']
+        assert Title.objects.get(pk=title.pk).updated_at > updated_at
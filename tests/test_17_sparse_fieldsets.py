@@ -0,0 +1,65 @@
+import pytest
+
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17SparseFieldsets:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+    USERS_URL = '/api/v1/users/'
+
+    def test_01_title_fields(self, admin_client, client,
+                             django_assert_num_queries):
+        create_titles(admin_client)
+        with django_assert_num_queries(3) as context:
+            response = client.get(
+                self.TITLES_URL, {'fields': 'id,name,year,rating'}
+            )
+        for title in response.json()['results']:
+            assert set(title) == {'id', 'name', 'year', 'rating'}, (
+                f'Проверьте, что `{self.TITLES_URL}?fields=` возвращает '
+                'только перечисленные поля.'
+            )
+        titles_sql = context.captured_queries[-1]['sql']
+        assert 'description' not in titles_sql, (
+            'Проверьте, что неотображаемые поля не загружаются из базы.'
+        )
+        assert 'reviews_category' not in titles_sql
+
+        response = client.get(self.TITLES_URL, {'omit': 'description,genre'})
+        for title in response.json()['results']:
+            assert set(title) == {'id', 'name', 'year', 'rating', 'category'}
+
+    def test_02_review_and_comment_fields(self, admin_client, admin, client,
+                                          django_assert_num_queries):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        with django_assert_num_queries(4) as context:
+            response = client.get(url, {'omit': 'author,text'})
+        assert set(response.json()['results'][0]) == {
+            'id', 'score', 'pub_date'
+        }
+        assert 'users_myuser' not in context.captured_queries[-1]['sql'], (
+            'Проверьте, что автор не загружается, если поле `author` не '
+            'запрошено.'
+        )
+
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        response = client.get(url, {'fields': 'id,author'})
+        assert response.json()['results'][0] == {
+            'id': response.json()['results'][0]['id'],
+            'author': admin.username,
+        }
+
+    def test_03_user_fields(self, admin_client, admin):
+        response = admin_client.get(self.USERS_URL, {'fields': 'username'})
+        assert response.json()['results'] == [{'username': admin.username}]
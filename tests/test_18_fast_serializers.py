@@ -0,0 +1,84 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from tests.utils import create_comments, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18FastSerializers:
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def assert_equivalent(self, fast_serializer_class, queryset, fields=None):
+        serializer_class = fast_serializer_class.serializer_class
+        fast = fast_serializer_class(fields)
+        expected = serializer_class(queryset.order_by('id'), many=True).data
+        if fields is not None:
+            expected = [
+                {name: item[name] for name in item if name in fields}
+                for item in expected
+            ]
+        actual = fast.serialize_many(fast.values(queryset.order_by('id')))
+        assert self.render(actual) == self.render(expected), (
+            f'Проверьте, что `{fast_serializer_class.__name__}` выдаёт тот '
+            f'же JSON, что и `{serializer_class.__name__}`.'
+        )
+
+    def test_01_titles_equivalent(self, admin_client, admin, user_client,
+                                  user):
+        from api.fast_serializers import FastTitleReadSerializer
+        from reviews.models import Category, Title
+
+        _, _, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        create_single_review(admin_client, titles[1]['id'], 'Ок', 7)
+        Title.objects.create(name='Без категории', year=2000)
+        Category.objects.filter(slug='books').delete()
+        queryset = Title.objects.select_related(
+            'category'
+        ).prefetch_related('genre')
+        self.assert_equivalent(FastTitleReadSerializer, queryset)
+        self.assert_equivalent(
+            FastTitleReadSerializer, queryset, {'id', 'genre', 'rating'}
+        )
+
+    def test_02_reviews_and_comments_equivalent(self, admin_client, admin,
+                                                user_client, user):
+        from api.fast_serializers import (
+            FastCommentSerializer, FastReviewSerializer
+        )
+        from reviews.models import Comment, Review
+
+        create_comments(admin_client, {admin: admin_client, user: user_client})
+        self.assert_equivalent(
+            FastReviewSerializer, Review.objects.prefetch_related('author')
+        )
+        self.assert_equivalent(
+            FastCommentSerializer, Comment.objects.prefetch_related('author')
+        )
+        self.assert_equivalent(
+            FastCommentSerializer, Comment.objects.all(), {'id', 'pub_date'}
+        )
+
+    def test_03_api_lists_match_drf_path(self, admin_client, admin, client,
+                                         settings):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        urls = (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/',
+        )
+        for url in urls:
+            fast = client.get(url).content
+            settings.FAST_READ_SERIALIZERS = False
+            regular = client.get(url).content
+            settings.FAST_READ_SERIALIZERS = True
+            assert fast == regular, (
+                f'Проверьте, что ответ `{url}` не зависит от настройки '
+                '`FAST_READ_SERIALIZERS`.'
+            )
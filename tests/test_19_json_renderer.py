@@ -0,0 +1,83 @@
+import datetime
+import io
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from tests.utils import create_titles
+
+
+class Test19JSONRenderer:
+
+    data = {
+        'count': 2,
+        'results': [
+            {
+                'name': 'Война и мир\u2028\u2029',
+                'date': datetime.datetime(
+                    2021, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc
+                ),
+                'day': datetime.date(2021, 1, 2),
+                'time': datetime.time(3, 4, 5),
+                'price': Decimal('1.50'),
+                'label': gettext_lazy('Имя'),
+                'items': (1, 2),
+            },
+            {'name': 'Ёж', 'rating': None, 'big': 2 ** 70},
+        ],
+    }
+
+    def test_01_same_bytes_as_drf(self):
+        from api.renderers import FastJSONRenderer
+
+        assert FastJSONRenderer().render(self.data) == JSONRenderer().render(
+            self.data
+        ), 'Проверьте, что `FastJSONRenderer` выдаёт тот же JSON, что и DRF.'
+        for media_type in ('application/json; indent=4', None):
+            assert FastJSONRenderer().render(
+                self.data, media_type, {'indent': 2}
+            ) == JSONRenderer().render(self.data, media_type, {'indent': 2})
+        assert FastJSONRenderer().render(None) == b''
+
+    def test_02_stdlib_fallback(self, monkeypatch):
+        from api import renderers
+        from api.parsers import FastJSONParser
+
+        monkeypatch.setattr(renderers, 'orjson', None)
+        monkeypatch.setattr('api.parsers.orjson', None)
+        assert renderers.FastJSONRenderer().render(
+            self.data
+        ) == JSONRenderer().render(self.data), (
+            'Проверьте, что без orjson используется стандартный модуль json.'
+        )
+        assert FastJSONParser().parse(io.BytesIO(b'{"a": [1]}')) == {
+            'a': [1]
+        }
+
+    def test_03_parser(self):
+        from api.parsers import FastJSONParser
+
+        body = '{"name": "Ёж", "year": 2000, "genre": ["a", "b"]}'.encode()
+        assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(
+            io.BytesIO(body)
+        )
+        for invalid in (b'{"name": ', b'{"a": NaN}', b''):
+            with pytest.raises(ParseError):
+                FastJSONParser().parse(io.BytesIO(invalid))
+        assert FastJSONParser().parse(
+            io.BytesIO('{"name": "Ёж"}'.encode('cp1251')),
+            parser_context={'encoding': 'cp1251'}
+        ) == {'name': 'Ёж'}
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_api_uses_fast_json(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        assert response.content == JSONRenderer().render(response.data), (
+            'Проверьте, что ответы API кодируются `FastJSONRenderer`.'
+        )
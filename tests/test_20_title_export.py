@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20TitleExport:
+
+    EXPORT_URL = '/api/v1/titles/export/'
+
+    def test_01_export_permissions(self, client, user_client, admin_client):
+        response = admin_client.get(self.EXPORT_URL)
+        assert response.status_code == 200, (
+            f'Эндпоинт `{self.EXPORT_URL}` не найден, проверьте настройки в '
+            '*urls.py*.'
+        )
+        for anonymous_or_user in (client, user_client):
+            response = anonymous_or_user.get(self.EXPORT_URL)
+            assert response.status_code in (401, 403), (
+                f'Проверьте, что `{self.EXPORT_URL}` доступен только '
+                'администратору.'
+            )
+
+    def test_02_ndjson(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(admin_client, titles[0]['id'], 'Ок', 7)
+        response = admin_client.get(self.EXPORT_URL)
+        assert response.streaming, (
+            f'Проверьте, что `{self.EXPORT_URL}` отдаёт потоковый ответ.'
+        )
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        exported = [json.loads(line) for line in lines]
+        listed = admin_client.get('/api/v1/titles/').json()['results']
+        assert exported == sorted(listed, key=lambda title: title['id']), (
+            f'Проверьте, что `{self.EXPORT_URL}` выгружает каждое '
+            'произведение в том же виде, что и список произведений.'
+        )
+        assert exported[0]['rating'] == 7
+
+    def test_03_csv_and_filters(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.get(self.EXPORT_URL, {'format': 'csv'})
+        assert response['Content-Type'] == 'text/csv; charset=utf-8'
+        rows = list(csv.DictReader(io.StringIO(
+            b''.join(response.streaming_content).decode()
+        )))
+        assert [row['name'] for row in rows] == [
+            title['name'] for title in titles
+        ]
+        assert rows[0]['genre'] == '|'.join(sorted(titles[0]['genre']))
+        assert rows[0]['category'] == titles[0]['category']
+        assert rows[0]['rating'] == ''
+
+        response = admin_client.get(self.EXPORT_URL, {'genre': 'drama'})
+        lines = b''.join(response.streaming_content).splitlines()
+        assert [json.loads(line)['id'] for line in lines] == [
+            titles[1]['id']
+        ], f'Проверьте, что `{self.EXPORT_URL}` учитывает фильтры.'
+
+    def test_04_reads_in_chunks(self, admin_client,
+                                django_assert_num_queries):
+        from api import views
+
+        create_titles(admin_client)
+        views.TITLES_EXPORT_CHUNK_SIZE, chunk_size = (
+            1, views.TITLES_EXPORT_CHUNK_SIZE
+        )
+        try:
+            response = admin_client.get(self.EXPORT_URL)
+            # One titles query, plus one genres query per chunk.
+            with django_assert_num_queries(3):
+                lines = b''.join(response.streaming_content).splitlines()
+        finally:
+            views.TITLES_EXPORT_CHUNK_SIZE = chunk_size
+        assert len(lines) == 2
@@ -0,0 +1,131 @@
+import pytest
+
+from tests.utils import create_categories, create_genre, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21TitleBulk:
+
+    BULK_URL = '/api/v1/titles/bulk/'
+
+    def items(self, count, **extra):
+        return [
+            {
+                'name': f'Произведение {idx}',
+                'year': 1950 + idx,
+                'genre': ['horror', 'drama'],
+                'category': 'films',
+                'description': 'Описание',
+                **extra,
+            }
+            for idx in range(count)
+        ]
+
+    def test_01_bulk_create(self, admin_client, user_client,
+                            django_assert_num_queries):
+        from reviews.models import Title, TitleGenre
+
+        create_genre(admin_client)
+        create_categories(admin_client)
+        response = user_client.post(
+            self.BULK_URL, data=self.items(1), format='json'
+        )
+        assert response.status_code == 403, (
+            f'Проверьте, что `{self.BULK_URL}` доступен только '
+            'администратору.'
+        )
+        with django_assert_num_queries(9):
+            response = admin_client.post(
+                self.BULK_URL, data=self.items(50), format='json'
+            )
+        assert response.status_code == 200, (
+            f'Эндпоинт `{self.BULK_URL}` не найден, проверьте настройки в '
+            '*urls.py*.'
+        )
+        results = response.json()['results']
+        assert [result['status'] for result in results] == ['created'] * 50
+        assert results[3]['data']['name'] == 'Произведение 3'
+        assert results[3]['data']['category'] == {
+            'name': 'Фильм', 'slug': 'films'
+        }
+        assert {genre['slug'] for genre in results[3]['data']['genre']} == {
+            'horror', 'drama'
+        }
+        assert Title.objects.count() == 50
+        assert TitleGenre.objects.count() == 100
+        title = Title.objects.get(pk=results[3]['data']['id'])
+        assert title.name_folded == 'произведение 3', (
+            'Проверьте, что массовое создание заполняет `name_folded`.'
+        )
+        response = admin_client.get('/api/v1/titles/', {'search': 'описание'})
+        assert response.json()['count'] == 50
+
+    def test_02_partial_errors(self, admin_client):
+        from reviews.models import Title
+
+        create_genre(admin_client)
+        create_categories(admin_client)
+        items = self.items(3)
+        items[1]['genre'] = ['unknown']
+        items[2]['year'] = 'не год'
+        items.append('не объект')
+        results = admin_client.post(
+            self.BULK_URL, data=items, format='json'
+        ).json()['results']
+        assert [result['status'] for result in results] == [
+            'created', 'invalid', 'invalid', 'invalid'
+        ], (
+            f'Проверьте, что `{self.BULK_URL}` сохраняет корректные '
+            'произведения и возвращает ошибки остальных.'
+        )
+        assert 'genre' in results[1]['errors']
+        assert 'year' in results[2]['errors']
+        assert Title.objects.count() == 1
+
+    def test_03_atomic(self, admin_client):
+        from reviews.models import Title
+
+        create_genre(admin_client)
+        create_categories(admin_client)
+        items = self.items(2)
+        items[1]['category'] = 'unknown'
+        response = admin_client.post(
+            f'{self.BULK_URL}?atomic=true', data=items, format='json'
+        )
+        assert response.status_code == 400
+        assert [result['status'] for result in response.json()['results']] == [
+            'skipped', 'invalid'
+        ]
+        assert not Title.objects.exists(), (
+            'Проверьте, что с `?atomic=true` ничего не сохраняется, если '
+            'хотя бы одно произведение некорректно.'
+        )
+
+    def test_04_bulk_update(self, admin_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.post(self.BULK_URL, data=[
+            {'id': titles[0]['id'], 'name': 'Терминатор 2',
+             'genre': ['drama']},
+            {'id': titles[1]['id'], 'year': 1990},
+            {'id': titles[1]['id'], 'year': 1991},
+            {'id': 10 ** 6, 'year': 1990},
+            {'name': 'Новое', 'year': 2020, 'genre': ['comedy'],
+             'category': 'books'},
+        ], format='json')
+        results = response.json()['results']
+        assert [result['status'] for result in results] == [
+            'updated', 'updated', 'invalid', 'invalid', 'created'
+        ]
+        assert results[0]['data']['name'] == 'Терминатор 2'
+        assert [g['slug'] for g in results[0]['data']['genre']] == [
+            'drama'
+        ]
+        assert results[1]['data']['year'] == 1990
+        assert [g['slug'] for g in results[1]['data']['genre']] == [
+            'drama'
+        ], 'Проверьте, что жанры без поля `genre` не меняются.'
+        assert Title.objects.get(pk=titles[0]['id']).name_folded == (
+            'терминатор 2'
+        )
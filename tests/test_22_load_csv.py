@@ -0,0 +1,312 @@
+import csv
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+
+def write_csv(path, header, rows):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+@pytest.fixture
+def csv_dir(tmp_path):
+    write_csv(
+        tmp_path / '1_users' / '1_myuser.csv',
+        ['id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name'],
+        [
+            [100, 'Bingo', 'bingo@yamdb.fake', 'user', '', '', ''],
+            [101, 'Ёжик', 'hedgehog@yamdb.fake', 'moderator', 'bio', '', ''],
+        ]
+    )
+    reviews = tmp_path / '2_reviews'
+    write_csv(reviews / '1_category.csv', ['id', 'name', 'slug'], [
+        [1, 'Фильм', 'movie']
+    ])
+    write_csv(reviews / '2_genre.csv', ['id', 'name', 'slug'], [
+        [1, 'Драма', 'drama'], [2, 'Комедия', 'comedy']
+    ])
+    write_csv(
+        reviews / '3_title.csv',
+        ['id', 'name', 'year', 'rating', 'description', 'category_id'],
+        [
+            [1, 'Побег из Шоушенка', 1994, '', '', 1],
+            [2, 'Крёстный Отец', 1972, '', 'Мафия', ''],
+        ]
+    )
+    write_csv(reviews / '4_title_genre.csv', ['id', 'title_id', 'genre_id'], [
+        [1, 1, 1], [2, 2, 1], [3, 2, 2]
+    ])
+    write_csv(
+        reviews / '5_review.csv',
+        ['id', 'title_id', 'text', 'author_id', 'score', 'pub_date'],
+        [
+            [1, 1, 'Ставлю десять звёзд!', 100, 10,
+             '2019-09-24T21:08:21.567Z'],
+            [2, 1, 'Неплохо,\nно скучно', 101, 5,
+             '2019-09-25T00:08:21+03:00'],
+        ]
+    )
+    write_csv(
+        reviews / '6_comment.csv',
+        ['id', 'review_id', 'text', 'author_id', 'pub_date'],
+        [[1, 1, 'Согласен', 101, '2020-01-13T23:20:02.422Z']]
+    )
+    return tmp_path
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22LoadCSV:
+
+    def test_01_load(self, csv_dir, client):
+        import datetime
+
+        from reviews.models import Comment, Review, Title
+        from users.models import MyUser
+
+        call_command('load_csv', path=csv_dir, batch_size=1)
+        assert MyUser.objects.get(pk=101).username_folded == 'ёжик', (
+            'Проверьте, что `load_csv` заполняет casefold-колонки.'
+        )
+        title = Title.objects.get(pk=1)
+        assert (title.rating_sum, title.review_count, title.rating) == (
+            15, 2, 7
+        ), 'Проверьте, что `load_csv` пересчитывает рейтинги произведений.'
+        other = Title.objects.get(pk=2)
+        assert other.rating is None and other.category_id is None
+        assert other.name_folded == 'крёстный отец'
+        assert Review.objects.get(pk=2).text == 'Неплохо,\nно скучно'
+        assert Review.objects.get(pk=2).pub_date == datetime.datetime(
+            2019, 9, 24, 21, 8, 21, tzinfo=datetime.timezone.utc
+        )
+        assert Comment.objects.get().pub_date.microsecond == 422000
+        response = client.get('/api/v1/titles/', {'search': 'мафия'})
+        assert [item['id'] for item in response.json()['results']] == [2]
+        response = client.get('/api/v1/titles/', {'genre': 'comedy'})
+        assert [item['id'] for item in response.json()['results']] == [2]
+
+    def test_02_all_or_nothing(self, csv_dir):
+        from reviews.models import Genre
+
+        write_csv(csv_dir / '2_reviews' / '6_comment.csv',
+                  ['id', 'review_id', 'text', 'author_id', 'pub_date'],
+                  [[1, 1, 'Согласен', 101, 'не дата']])
+        with pytest.raises(CommandError):
+            call_command('load_csv', path=csv_dir)
+        assert not Genre.objects.exists(), (
+            'Проверьте, что при ошибке `load_csv` ничего не загружает.'
+        )
+
+    def test_03_parallel_dependency_order(self, csv_dir):
+        from reviews.csv_loader import csv_files, dependency_order
+        from reviews.models import Comment, Review, Title
+
+        reviews = csv_dir / '2_reviews'
+        (reviews / '6_comment.csv').rename(reviews / '0_comment.csv')
+        (reviews / '3_title.csv').rename(reviews / '9_title.csv')
+        order = [
+            table for _, table in dependency_order(list(csv_files(csv_dir)))
+        ]
+        assert order == [
+            'users_myuser', 'reviews_category', 'reviews_genre',
+            'reviews_title', 'reviews_title_genre', 'reviews_review',
+            'reviews_comment',
+        ], 'Проверьте, что таблицы загружаются в порядке внешних ключей.'
+        call_command('load_csv', path=csv_dir, batch_size=1, workers=2)
+        assert Title.objects.count() == 2
+        assert Review.objects.count() == 2, (
+            'Проверьте, что `load_csv --workers` загружает все строки.'
+        )
+        assert Comment.objects.get().review_id == 1
+
+    def test_04_incremental(self, csv_dir):
+        from io import StringIO
+
+        from reviews.csv_loader import TableLoader, model_connection
+        from reviews.models import Genre, Title
+        from users.models import MyUser
+
+        call_command('load_csv', path=csv_dir, batch_size=1)
+        joined = MyUser.objects.get(pk=100).date_joined
+        with pytest.raises(CommandError):
+            call_command('load_csv', path=csv_dir)
+
+        out = StringIO()
+        call_command('load_csv', path=csv_dir, batch_size=1,
+                     incremental=True, stdout=out)
+        assert out.getvalue().count('unchanged, skipped') == 7, (
+            'Проверьте, что `load_csv --incremental` пропускает '
+            'неизменённые файлы.'
+        )
+
+        reviews = csv_dir / '2_reviews'
+        write_csv(
+            reviews / '3_title.csv',
+            ['id', 'name', 'year', 'rating', 'description', 'category_id'],
+            [
+                [1, 'Побег из Шоушенка', 1994, '', '', 1],
+                [2, 'Крёстный Отец 2', 1974, '', 'Мафия', 1],
+            ]
+        )
+        write_csv(reviews / '2_genre.csv', ['id', 'name', 'slug'], [
+            [1, 'Драма', 'drama'], [2, 'Комедия', 'comedy'],
+            [3, 'Ужасы', 'horror'],
+        ])
+        write_csv(
+            csv_dir / '1_users' / '1_myuser.csv',
+            ['id', 'username', 'email', 'role', 'bio'],
+            [
+                [100, 'Bingo', 'bingo@yamdb.fake', 'user', 'Новое'],
+                [101, 'Ёжик', 'hedgehog@yamdb.fake', 'moderator', 'bio'],
+            ]
+        )
+        out = StringIO()
+        call_command('load_csv', path=csv_dir, batch_size=1,
+                     incremental=True, stdout=out)
+        assert 'reviews_title: 1 rows' in out.getvalue(), (
+            'Проверьте, что `load_csv --incremental` записывает только '
+            'изменённые пачки строк.'
+        )
+        title = Title.objects.get(pk=2)
+        assert (title.name, title.name_folded, title.year) == (
+            'Крёстный Отец 2', 'крёстный отец 2', 1974
+        )
+        assert Title.objects.get(pk=1).rating == 7
+        loader = TableLoader(
+            Title, ['id', 'name', 'rating'], model_connection(Title)
+        )
+        assert '"rating"' not in loader.upsert_sql.split('DO UPDATE')[1], (
+            'Проверьте, что upsert не перезаписывает рейтинг произведения.'
+        )
+        assert Genre.objects.get(pk=3).slug == 'horror'
+        user = MyUser.objects.get(pk=100)
+        assert (user.bio, user.date_joined) == ('Новое', joined), (
+            'Проверьте, что upsert не перезаписывает колонки, которых нет '
+            'в файле.'
+        )
+
+    def test_05_reject_file(self, csv_dir):
+        from io import StringIO
+
+        from reviews.models import Review, Title
+
+        reviews = csv_dir / '2_reviews'
+        write_csv(
+            reviews / '3_title.csv',
+            ['id', 'name', 'year', 'rating', 'description', 'category_id'],
+            [
+                [1, 'Побег из Шоушенка', 1994, '', '', 1],
+                [2, 'Крёстный Отец', 1972, '', 'Мафия', ''],
+                [3, 'Из будущего', 3000, '', '', 1],
+                [4, 'Без категории', 2000, '', '', 7],
+            ]
+        )
+        write_csv(
+            reviews / '5_review.csv',
+            ['id', 'title_id', 'text', 'author_id', 'score', 'pub_date'],
+            [
+                [1, 1, 'Ставлю десять звёзд!', 100, 10,
+                 '2019-09-24T21:08:21.567Z'],
+                [2, 1, 'Неплохо', 101, 11, '2019-09-25T00:08:21Z'],
+                [3, 1, 'Ещё раз', 100, 9, '2019-09-26T00:08:21Z'],
+                [4, 2, 'Шедевр', 101, 'десять', '2019-09-27T00:08:21Z'],
+            ]
+        )
+        rejects = csv_dir / 'rejects.csv'
+        out = StringIO()
+        call_command('load_csv', path=csv_dir, batch_size=2,
+                     reject_file=str(rejects), stdout=out)
+        output = out.getvalue()
+        assert 'reviews_title: 2 rows' in output
+        assert 'reviews_review: 1 rows' in output
+        assert 'Loaded 12 rows' in output, (
+            'Проверьте, что `load_csv --reject-file` не учитывает '
+            'отклонённые строки в числе загруженных.'
+        )
+        assert set(Title.objects.values_list('pk', flat=True)) == {1, 2}
+        assert list(Review.objects.values_list('pk', flat=True)) == [1], (
+            'Проверьте, что `load_csv --reject-file` загружает корректные '
+            'строки.'
+        )
+        assert Title.objects.get(pk=1).rating == 10
+        with open(rejects, encoding='utf-8', newline='') as csvfile:
+            rows = list(csv.reader(csvfile))
+        assert rows[0] == ['file', 'record', 'reason', 'cells']
+        assert [row[:2] for row in rows[1:]] == [
+            ['2_reviews/3_title.csv', '3'],
+            ['2_reviews/3_title.csv', '4'],
+            ['2_reviews/5_review.csv', '2'],
+            ['2_reviews/5_review.csv', '3'],
+            ['2_reviews/5_review.csv', '4'],
+        ], 'Проверьте, что отклонённые строки записываются в файл.'
+        reasons = [row[2] for row in rows[1:]]
+        assert reasons[0].startswith('year:')
+        assert reasons[1] == 'category_id: 7 does not exist'
+        assert reasons[2].startswith('score:')
+        assert reasons[3] == 'title_id, author_id: duplicate value'
+        assert rows[2][3:] == [
+            '4', 'Без категории', '2000', '', '', '7'
+        ]
+
+    def test_06_reject_budget(self, csv_dir):
+        from reviews.models import Genre, Review
+
+        write_csv(
+            csv_dir / '2_reviews' / '5_review.csv',
+            ['id', 'title_id', 'text', 'author_id', 'score', 'pub_date'],
+            [
+                [idx, 1, 'Текст', 100, 0, '2019-09-24T21:08:21Z']
+                for idx in range(1, 5)
+            ]
+        )
+        with pytest.raises(CommandError):
+            call_command('load_csv', path=csv_dir, max_rejects=2,
+                         reject_file=str(csv_dir / 'rejects.csv'))
+        assert Genre.objects.count() == 2, (
+            'Проверьте, что при превышении лимита ошибок уже загруженные '
+            'пачки строк сохраняются.'
+        )
+        assert not Review.objects.exists()
+
+    def test_07_missing_author(self, csv_dir):
+        from reviews.models import Genre
+        from users.models import MyUser
+
+        write_csv(
+            csv_dir / '2_reviews' / '5_review.csv',
+            ['id', 'title_id', 'text', 'author_id', 'score', 'pub_date'],
+            [[1, 1, 'Текст', 999, 5, '2019-09-24T21:08:21Z']]
+        )
+        with pytest.raises(CommandError, match='author_id'):
+            call_command('load_csv', path=csv_dir)
+        assert not Genre.objects.exists() and not MyUser.objects.exists(), (
+            'Проверьте, что `load_csv` проверяет ссылки на пользователей, '
+            'которые база данных не проверяет.'
+        )
+
+    def test_08_live_database(self, csv_dir):
+        import sqlite3
+
+        from django.db import connection
+
+        from reviews.models import Title
+
+        # A worker of the running site with an open read transaction.
+        reader = sqlite3.connect(connection.settings_dict['NAME'])
+        try:
+            reader.execute('BEGIN')
+            reader.execute('SELECT COUNT(*) FROM reviews_title').fetchone()
+            call_command('load_csv', path=csv_dir)
+        finally:
+            reader.close()
+        assert Title.objects.count() == 2, (
+            'Проверьте, что `load_csv` работает, пока другие соединения '
+            'читают базу.'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            assert cursor.fetchone()[0] == 'wal'
@@ -0,0 +1,87 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import connection, transaction
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tests.utils import create_titles
+
+THREADS = 16
+
+
+def run_in_threads(function, items):
+    """Run `function` over `items` at once, one thread and connection each."""
+    def target(item):
+        try:
+            return function(item)
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=len(items)) as executor:
+        return list(executor.map(target, items))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23SQLiteConcurrency:
+
+    def test_01_connection_pragmas(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            journal_mode = cursor.fetchone()[0]
+            cursor.execute('PRAGMA busy_timeout')
+            busy_timeout = cursor.fetchone()[0]
+        assert (journal_mode, busy_timeout) == ('wal', 5000), (
+            'Проверьте, что соединения с SQLite работают в режиме WAL '
+            'и ждут блокировку записи.'
+        )
+
+    def test_02_concurrent_reviews(self, admin_client, django_user_model,
+                                   settings):
+        # Lock waits are not what query budgets are about.
+        settings.QUERY_BUDGET_MODE = None
+        titles, _, _ = create_titles(admin_client)
+        users = [
+            django_user_model.objects.create_user(
+                username=f'user{idx}', email=f'user{idx}@yamdb.fake'
+            ) for idx in range(THREADS)
+        ]
+
+        def post_reviews(user):
+            client = APIClient()
+            client.credentials(
+                HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'
+            )
+            return [
+                client.post(
+                    f'/api/v1/titles/{title["id"]}/reviews/',
+                    data={'text': 'Текст', 'score': idx % 10 + 1}
+                ).status_code
+                for idx, title in enumerate(titles)
+            ]
+
+        statuses = run_in_threads(post_reviews, users)
+        assert statuses == [[201] * len(titles)] * THREADS, (
+            'Проверьте, что одновременные POST-запросы к отзывам не падают '
+            'с ошибкой блокировки базы данных.'
+        )
+        response = admin_client.get(f'/api/v1/titles/{titles[1]["id"]}/')
+        assert response.json()['rating'] == 2, (
+            'Проверьте, что одновременные отзывы учитываются в рейтинге.'
+        )
+
+    def test_03_read_then_write_transactions(self):
+        from reviews.models import Genre
+
+        def create_genre(idx):
+            # A deferred transaction that read before another connection
+            # committed can never take the write lock.
+            with transaction.atomic():
+                count = Genre.objects.count()
+                Genre.objects.create(name=f'Жанр {count}', slug=f'g{idx}')
+
+        run_in_threads(create_genre, list(range(THREADS)))
+        assert Genre.objects.count() == THREADS, (
+            'Проверьте, что транзакции записи сразу берут блокировку '
+            'записи (`BEGIN IMMEDIATE`).'
+        )
@@ -0,0 +1,90 @@
+import sqlite3
+
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+def count_queries(client, method, url, **kwargs):
+    """Queries a request sends to the primary and to the replica."""
+    with CaptureQueriesContext(connections['default']) as primary, \
+            CaptureQueriesContext(connections['replica']) as replica:
+        response = getattr(client, method)(url, **kwargs)
+    return response, len(primary), len(replica)
+
+
+@pytest.mark.django_db(transaction=True, databases='__all__')
+class Test24ReadReplicas:
+
+    TITLES_URL = '/api/v1/titles/'
+    LAG_URL = '/api/v1/metrics/replica-lag/'
+
+    @pytest.fixture(autouse=True)
+    def enable_replicas(self, settings):
+        settings.DATABASE_REPLICAS = ['replica']
+        settings.DATABASE_REPLICA_PIN_SECONDS = 60
+
+    def test_01_routing(self, admin_client, user_client, client):
+        titles, _, _ = create_titles(admin_client)
+        response, primary, replica = count_queries(
+            user_client, 'get', self.TITLES_URL
+        )
+        assert response.status_code == 200
+        assert primary == 0 and replica > 0, (
+            'Проверьте, что GET-запросы читают из реплики.'
+        )
+
+        reviews_url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        response, primary, replica = count_queries(
+            user_client, 'post', reviews_url,
+            data={'text': 'Текст', 'score': 7}
+        )
+        assert response.status_code == 201
+        assert primary > 0 and replica == 0, (
+            'Проверьте, что запросы на запись идут в основную базу.'
+        )
+        _, primary, replica = count_queries(user_client, 'get', reviews_url)
+        assert primary > 0 and replica == 0, (
+            'Проверьте, что клиент после записи читает из основной базы.'
+        )
+        _, primary, replica = count_queries(client, 'get', reviews_url)
+        assert primary == 0 and replica > 0, (
+            'Проверьте, что закрепление за основной базой действует только '
+            'для клиента, который записывал.'
+        )
+
+    def test_02_no_replicas(self, client, settings):
+        settings.DATABASE_REPLICAS = []
+        _, primary, replica = count_queries(client, 'get', self.TITLES_URL)
+        assert primary > 0 and replica == 0
+
+    def test_03_replica_lag(self, admin_client, user_client):
+        from reviews.replicas import record_heartbeat
+
+        assert admin_client.get(self.LAG_URL).json() == {'replica': None}
+        record_heartbeat()
+        lag = admin_client.get(self.LAG_URL).json()['replica']
+        assert 0 <= lag < 60, (
+            f'Проверьте, что `{self.LAG_URL}` возвращает отставание '
+            'реплики в секундах.'
+        )
+        assert user_client.get(self.LAG_URL).status_code == 403
+
+    def test_04_copy_database(self, admin_client, tmp_path):
+        from reviews.replicas import copy_database, sync_replica
+
+        create_titles(admin_client)
+        with pytest.raises(ValueError):
+            sync_replica('replica')
+        primary = connections['default']
+        primary.ensure_connection()
+        target = sqlite3.connect(tmp_path / 'replica.sqlite3')
+        copy_database(primary.connection, target)
+        assert target.execute(
+            'SELECT name FROM reviews_title ORDER BY id'
+        ).fetchall() == [('Терминатор',), ('Крепкий орешек',)], (
+            'Проверьте, что реплика получает копию основной базы.'
+        )
+        target.close()
@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+from django.conf import settings
+from django.db import connections, transaction
+
+from tests.utils import create_comments, create_single_review
+
+split_only = pytest.mark.skipif(
+    'config.getoption("single_database")',
+    reason='Users share the default database.'
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25SplitDatabases:
+
+    @split_only
+    def test_01_users_database(self):
+        default_tables = connections['default'].introspection.table_names()
+        users_tables = connections['users'].introspection.table_names()
+        assert 'users_myuser' in users_tables, (
+            'Проверьте, что пользователи хранятся в базе `users`.'
+        )
+        assert 'users_myuser' not in default_tables
+        assert 'reviews_review' in default_tables
+        assert 'reviews_review' not in users_tables
+
+    def test_02_user_delete_cascades(self, admin_client, admin, user_client,
+                                     user):
+        from reviews.models import Comment, Review, Title
+
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        create_single_review(user_client, titles[1]['id'], 'Ок', 9)
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == 204
+        assert list(Review.objects.values_list('id', flat=True)) == [
+            reviews[0]['id']
+        ], 'Проверьте, что отзывы удалённого пользователя удаляются.'
+        assert list(Comment.objects.values_list('id', flat=True)) == [
+            comments[0]['id']
+        ], 'Проверьте, что комментарии удалённого пользователя удаляются.'
+        assert [
+            (title.review_count, title.rating) for title in
+            Title.objects.filter(pk__in=[titles[0]['id'], titles[1]['id']])
+        ] == [(1, 5), (0, None)], (
+            'Проверьте, что рейтинг пересчитывается после удаления '
+            'пользователя.'
+        )
+
+    @split_only
+    def test_03_signups_do_not_block_reviews(self, django_user_model,
+                                             user_client):
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Чужой', year=1979)
+        responses = []
+
+        def post_review():
+            try:
+                responses.append(user_client.post(
+                    f'/api/v1/titles/{title.pk}/reviews/',
+                    data={'text': 'Текст', 'score': 8}
+                ).status_code)
+            finally:
+                connections.close_all()
+
+        with transaction.atomic(using=settings.DATABASE_APPS_MAPPING['users']):
+            # Holds the write lock of the users database.
+            django_user_model.objects.create_user(
+                username='newbie', email='newbie@yamdb.fake'
+            )
+            thread = threading.Thread(target=post_review)
+            thread.start()
+            thread.join(timeout=2)
+            written_while_locked = list(responses)
+        thread.join()
+        assert written_while_locked == [201], (
+            'Проверьте, что запись пользователей не блокирует запись '
+            'отзывов.'
+        )
@@ -0,0 +1,96 @@
+import csv
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26ListCache:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    GENRES_URL = '/api/v1/genres/'
+
+    def slugs(self, client, url, params=None):
+        return [
+            item['slug'] for item in client.get(url, params).json()['results']
+        ]
+
+    @pytest.mark.parametrize('url', (CATEGORIES_URL, GENRES_URL))
+    def test_01_cached_list(self, admin_client, client, url,
+                            django_assert_num_queries):
+        admin_client.post(url, data={'name': 'Первый', 'slug': 'first'})
+        admin_client.post(url, data={'name': 'Второй', 'slug': 'second'})
+        assert self.slugs(client, url) == ['first', 'second']
+        with django_assert_num_queries(0):
+            response = client.get(url)
+        assert response.json()['count'] == 2, (
+            f'Проверьте, что повторный GET-запрос к `{url}` отдаётся из кэша.'
+        )
+        assert self.slugs(client, url, {'search': 'вто'}) == ['second'], (
+            'Проверьте, что ключ кэша учитывает параметры запроса.'
+        )
+        response = client.get(url, HTTP_HOST='example.com')
+        assert response.json()['count'] == 2
+
+        admin_client.post(url, data={'name': 'Третий', 'slug': 'third'})
+        assert self.slugs(client, url) == ['first', 'second', 'third'], (
+            'Проверьте, что создание объекта сбрасывает кэш списка.'
+        )
+        admin_client.delete(f'{url}first/')
+        assert self.slugs(client, url) == ['second', 'third'], (
+            'Проверьте, что удаление объекта сбрасывает кэш списка.'
+        )
+
+    def test_02_orm_and_bulk_writes(self, client, tmp_path):
+        from reviews.models import Genre
+
+        Genre.objects.create(name='Драма', slug='drama')
+        assert self.slugs(client, self.GENRES_URL) == ['drama']
+        Genre.objects.filter(slug='drama').delete()
+        assert self.slugs(client, self.GENRES_URL) == [], (
+            'Проверьте, что запись через ORM и админку сбрасывает кэш.'
+        )
+
+        directory = tmp_path / '2_reviews'
+        directory.mkdir()
+        with open(directory / '2_genre.csv', 'w', encoding='utf-8',
+                  newline='') as csvfile:
+            csv.writer(csvfile).writerows([
+                ['id', 'name', 'slug'], [1, 'Ужасы', 'horror']
+            ])
+        call_command('load_csv', path=tmp_path)
+        assert self.slugs(client, self.GENRES_URL) == ['horror'], (
+            'Проверьте, что `load_csv` сбрасывает кэш списков.'
+        )
+
+    def test_03_shared_between_workers(self, client, settings):
+        from django.core.cache import caches
+
+        from api_yamdb.cache_versions import (
+            bump_version, check_shared_cache, model_version_name
+        )
+        from reviews.models import Genre
+
+        assert check_shared_cache(None) == [], (
+            'Проверьте, что кэш по умолчанию общий для всех процессов.'
+        )
+        Genre.objects.create(name='Драма', slug='drama')
+        assert self.slugs(client, self.GENRES_URL) == ['drama']
+        # Another worker renames the genre without this process's signals.
+        Genre.objects.filter(slug='drama').update(name='Мелодрама')
+        worker = caches.create_connection('default')
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setattr('api_yamdb.cache_versions.cache', worker)
+            bump_version(model_version_name(Genre))
+        response = client.get(self.GENRES_URL)
+        assert response.json()['results'][0]['name'] == 'Мелодрама', (
+            'Проверьте, что версии кэша, изменённые другим процессом, '
+            'сбрасывают кэш списков.'
+        )
+
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }}
+        assert [warning.id for warning in check_shared_cache(None)] == [
+            'api_yamdb.W001'
+        ]
@@ -0,0 +1,138 @@
+from http import HTTPStatus
+
+import pytest
+from django.utils.http import http_date
+
+from tests.utils import create_comments, create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27ConditionalGet:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def assert_not_modified(self, client, url, response):
+        assert client.get(
+            url, HTTP_IF_NONE_MATCH=response['ETag']
+        ).status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с неизменившимся '
+            '`If-None-Match` возвращает статус 304.'
+        )
+
+    def assert_modified(self, client, url, response):
+        assert client.get(
+            url, HTTP_IF_NONE_MATCH=response['ETag']
+        ).status_code == HTTPStatus.OK, (
+            f'Проверьте, что после изменения данных GET-запрос к `{url}` '
+            'возвращает новое содержимое.'
+        )
+
+    def test_01_title_detail(self, admin_client, client,
+                             django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response['ETag'].startswith('"'), (
+            'Проверьте, что ответ содержит сильный `ETag`.'
+        )
+        assert 'Last-Modified' in response
+        with django_assert_num_queries(1):
+            not_modified = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert not_modified.status_code == HTTPStatus.NOT_MODIFIED
+        assert not_modified['ETag'] == response['ETag']
+        assert not not_modified.content
+        assert client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        ).status_code == HTTPStatus.NOT_MODIFIED
+        assert client.get(
+            url, HTTP_IF_MODIFIED_SINCE=http_date(0)
+        ).status_code == HTTPStatus.OK
+        assert client.get(
+            url, {'fields': 'id'}, HTTP_IF_NONE_MATCH=response['ETag']
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что `ETag` зависит от параметров запроса.'
+        )
+
+        admin_client.patch(url, data={'name': 'Новое имя'})
+        self.assert_modified(client, url, response)
+        response = client.get(url)
+        create_single_review(admin_client, titles[0]['id'], 'Отзыв', 5)
+        self.assert_modified(client, url, response)
+        assert client.get(f'{self.TITLES_URL}0/').status_code == (
+            HTTPStatus.NOT_FOUND
+        )
+
+    def test_02_title_list(self, admin_client, client):
+        from reviews.models import Category, Genre
+
+        titles, categories, genres = create_titles(admin_client)
+        response = client.get(self.TITLES_URL)
+        self.assert_not_modified(client, self.TITLES_URL, response)
+
+        genre = Genre.objects.get(slug=genres[0]['slug'])
+        genre.name = 'Другой жанр'
+        genre.save()
+        self.assert_modified(client, self.TITLES_URL, response)
+        response = client.get(self.TITLES_URL)
+        Category.objects.get(slug=categories[0]['slug']).delete()
+        self.assert_modified(client, self.TITLES_URL, response)
+        response = client.get(self.TITLES_URL)
+        admin_client.delete(f'{self.TITLES_URL}{titles[0]["id"]}/')
+        self.assert_modified(client, self.TITLES_URL, response)
+
+    def test_03_reviews_and_comments(self, admin_client, admin, user_client,
+                                     user, client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        review_url = f'{reviews_url}{reviews[0]["id"]}/'
+        review = client.get(review_url)
+        review_list = client.get(reviews_url)
+        comment_list = client.get(comments_url)
+        self.assert_not_modified(client, review_url, review)
+        self.assert_not_modified(client, reviews_url, review_list)
+        self.assert_not_modified(client, comments_url, comment_list)
+
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'username': 'renamed'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        self.assert_modified(client, reviews_url, review_list)
+        self.assert_modified(client, comments_url, comment_list)
+        self.assert_not_modified(client, review_url, review)
+
+        comment_list = client.get(comments_url)
+        admin_client.delete(f'{comments_url}{comments[0]["id"]}/')
+        self.assert_modified(client, comments_url, comment_list)
+
+    def test_04_malformed_ids(self, admin_client, admin, client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        for url in (
+            f'{self.TITLES_URL}abc/',
+            f'{reviews_url}abc/',
+            f'{comments_url}abc/',
+            self.REVIEWS_URL_TEMPLATE.format(title_id='abc'),
+        ):
+            assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что GET-запрос к `{url}` с некорректным '
+                'идентификатором возвращает статус 404.'
+            )